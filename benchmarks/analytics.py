@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Check that --analytics gives the same results with and without NumPy.
+
+Builds a deterministic synthetic attempt table, runs the NumPy and the
+pure-Python analytics passes over it, compares every statistic and prints
+both timings. Exits non-zero when any statistic differs. Without NumPy
+installed there is nothing to compare; only the pure-Python pass is timed.
+
+    python3 benchmarks/analytics.py [--solutions 30000] [--attempts 10] [--output FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+from corpus import BASE_TIMESTAMP, memorizer
+
+DEFAULT_SOLUTIONS = 30_000
+DEFAULT_ATTEMPTS = 10
+MAX_GAP_DAYS = 40.0  # gaps between attempts span every decay bucket
+PERFECT_RATE = 0.2
+
+
+def build_table(solutions: int, attempts: int, seed: int) -> memorizer.AttemptTable:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(solutions):
+        rel = f"set{i // 100:03d}/solution_{i:05d}.md"
+        graded_at = BASE_TIMESTAMP + i
+        for number in range(1, attempts + 1):
+            graded_at += rng.random() * MAX_GAP_DAYS * memorizer.SECONDS_PER_DAY
+            perfect = rng.random() < PERFECT_RATE
+            score = 100.0 if perfect else round(rng.random() * 100, 1)
+            rows.append([rel, number, graded_at, score, perfect])
+    columns = list(zip(*rows))
+    return memorizer.AttemptTable(*(list(column) for column in columns))
+
+
+def differences(expected: object, actual: object, where: str = "") -> list[str]:
+    """Paths at which two analysis results differ; floats compare to 1e-9."""
+    if isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+        if len(expected) != len(actual):
+            return [f"{where}: {len(expected)} items vs {len(actual)}"]
+        found = []
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            found.extend(differences(a, b, f"{where}[{i}]"))
+        return found
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        found = []
+        for key in sorted(set(expected) | set(actual)):
+            found.extend(differences(expected.get(key), actual.get(key), f"{where}.{key}"))
+        return found
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        if math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-9):
+            return []
+    elif expected == actual:
+        return []
+    return [f"{where}: {expected!r} vs {actual!r}"]
+
+
+def timed(func, *args) -> tuple[dict, float]:
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--solutions", type=int, default=DEFAULT_SOLUTIONS,
+                        help=f"Solutions in the table (default: {DEFAULT_SOLUTIONS}).")
+    parser.add_argument("--attempts", type=int, default=DEFAULT_ATTEMPTS,
+                        help=f"Attempts per solution (default: {DEFAULT_ATTEMPTS}).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+    if args.solutions < 1 or args.attempts < 1:
+        memorizer.die("--solutions and --attempts must be at least 1.")
+
+    table = build_table(args.solutions, args.attempts, args.seed)
+    now = max(table.times) + memorizer.SECONDS_PER_DAY
+    python_result, python_ms = timed(memorizer._analyze_python, table, now)
+    results = {
+        "python": sys.version.split()[0],
+        "attempts": len(table),
+        "python_ms": round(python_ms, 1),
+    }
+
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    found: list[str] = []
+    if numpy is None:
+        print("numpy is not installed; only the pure-Python pass was timed.", file=sys.stderr)
+    else:
+        numpy_result, numpy_ms = timed(memorizer._analyze_numpy, table, now, numpy)
+        found = differences(python_result, numpy_result)
+        results["numpy"] = numpy.__version__
+        results["numpy_ms"] = round(numpy_ms, 1)
+        results["differences"] = len(found)
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    for difference in found[:20]:
+        print(f"FAIL: result{difference}", file=sys.stderr)
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
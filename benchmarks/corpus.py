@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Deterministic synthetic corpus for memorizer benchmarks.
+
+Generates N solutions with K target blocks of L lines each, cycling through
+several languages, under ROOT/solutions/, and M graded attempts per solution
+under ROOT/attempts/ with a controlled per-line error rate. The same
+arguments and seed always produce the same files.
+
+    python3 benchmarks/corpus.py ROOT --solutions 100 --blocks 3 --lines 40 \\
+        --attempts 5 --error-rate 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import memorizer  # noqa: E402
+
+LANGUAGES = ("python", "javascript", "rust", "go", "c")
+SOLUTIONS_PER_DIR = 25
+BASE_TIMESTAMP = 1_700_000_000.0  # fixed so records are reproducible
+ATTEMPT_SPACING = 86_400.0        # one attempt per day
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Shape of a generated corpus."""
+    solutions: int = 100
+    blocks: int = 3
+    lines: int = 40
+    attempts: int = 5
+    error_rate: float = 0.1  # probability that an attempt line is wrong
+    seed: int = 0
+
+
+def use_root(root: Path) -> None:
+    """Point memorizer's solutions, attempts and caches at root."""
+    root = root.resolve()
+    memorizer.SOLUTIONS_ROOT = root / "solutions"
+    memorizer.FOCUS_DIR = memorizer.SOLUTIONS_ROOT / "focus"
+    memorizer.ATTEMPTS_ROOT = root / "attempts"
+
+    # Move every path under the current cache directory (index, logs,
+    # metrics, socket), so new cache files cannot be missed here
+    old_cache = memorizer.CACHE_ROOT
+    memorizer.CACHE_ROOT = root / ".cache"
+    for name, value in list(vars(memorizer).items()):
+        if name.isupper() and isinstance(value, Path) and old_cache in value.parents:
+            setattr(memorizer, name, memorizer.CACHE_ROOT / value.relative_to(old_cache))
+    # A textfile collector path from the environment would also escape root
+    os.environ[memorizer.METRICS_FILE_ENV] = str(memorizer.DEFAULT_METRICS_FILE)
+
+    memorizer._LISTING_CACHE.clear()
+    memorizer._CATALOG_MEMO = None
+    memorizer._HISTORY_INDEX = None
+
+
+def _code_line(rng: random.Random, language: str, depth: int) -> str:
+    name = f"v{rng.randrange(1000)}"
+    call = f"step_{rng.randrange(100)}({name}, {rng.randrange(10_000)})"
+    indent = "    " * depth
+    if language == "python":
+        return f"{indent}{name} = {call}"
+    if language == "go":
+        return f"{indent}{name} := {call}"
+    if language == "rust":
+        return f"{indent}let {name} = {call};"
+    if language == "javascript":
+        return f"{indent}const {name} = {call};"
+    return f"{indent}int {name} = {call};"
+
+
+def solution_text(rng: random.Random, title: str, spec: CorpusSpec, offset: int) -> str:
+    parts = [f"# {title}\n", f"Synthetic solution with {spec.blocks} blocks.\n"]
+    for k in range(spec.blocks):
+        language = LANGUAGES[(offset + k) % len(LANGUAGES)]
+        body = "\n".join(
+            _code_line(rng, language, rng.randrange(3)) for _ in range(spec.lines)
+        )
+        parts.append(f"## Part {k + 1}\n\n```{language}\n{body}\n```\n")
+    return "\n".join(parts)
+
+
+def mutate_block(rng: random.Random, content: str, error_rate: float) -> str:
+    """Recall a block with each line wrong (edited, dropped or duplicated) at error_rate."""
+    recalled: list[str] = []
+    for line in content.split("\n"):
+        if rng.random() >= error_rate:
+            recalled.append(line)
+            continue
+        kind = rng.randrange(3)
+        if kind == 0 and line:
+            pos = rng.randrange(len(line))
+            recalled.append(line[:pos] + "x" + line[pos + 1:])
+        elif kind == 1:
+            continue
+        else:
+            recalled.extend((line, line))
+    return "\n".join(recalled)
+
+
+def generate_corpus(root: Path, spec: CorpusSpec) -> list[Path]:
+    """Write the corpus under root and return the solution paths."""
+    use_root(root)
+    rng = random.Random(spec.seed)
+    memorizer.ATTEMPTS_ROOT.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for i in range(spec.solutions):
+        directory = memorizer.SOLUTIONS_ROOT / f"set{i // SOLUTIONS_PER_DIR:03d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"solution_{i:05d}.md"
+        text = solution_text(rng, f"Solution {i}", spec, i)
+        path.write_text(text, encoding="utf-8")
+        paths.append(path)
+
+        parsed = memorizer.parse_markdown(text)
+        for n in range(1, spec.attempts + 1):
+            contents = [
+                mutate_block(rng, block.content, spec.error_rate) for block in parsed.target_blocks
+            ]
+            attempt_text = memorizer.fill_attempt_template(parsed, contents)
+            attempt_path = memorizer.ATTEMPTS_ROOT / f"{path.stem}-{n}.attempt.md"
+            attempt_path.write_text(attempt_text, encoding="utf-8")
+
+            results = memorizer.grade_attempt(parsed, attempt_text)
+            graded_at = BASE_TIMESTAMP + i + n * ATTEMPT_SPACING
+            record = memorizer.build_attempt_record(
+                path,
+                attempt_path,
+                [memorizer.summarize_block(r) for r in results],
+                started_at=graded_at - 60,
+                graded_at=graded_at,
+            )
+            memorizer.write_attempt_record(attempt_path, record)
+    return paths
+
+
+def main(argv: list[str] | None = None) -> int:
+    defaults = CorpusSpec()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", type=Path, help="Directory to create solutions/ and attempts/ in.")
+    parser.add_argument("--solutions", type=int, default=defaults.solutions)
+    parser.add_argument("--blocks", type=int, default=defaults.blocks)
+    parser.add_argument("--lines", type=int, default=defaults.lines)
+    parser.add_argument("--attempts", type=int, default=defaults.attempts)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args(argv)
+
+    if args.root.resolve() == REPO_ROOT:
+        memorizer.die("Refusing to generate a corpus over the repository's own solutions.")
+    spec = CorpusSpec(
+        solutions=args.solutions,
+        blocks=args.blocks,
+        lines=args.lines,
+        attempts=args.attempts,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    paths = generate_corpus(args.root, spec)
+    print(f"Wrote {len(paths)} solutions and {len(paths) * spec.attempts} attempts under {args.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Peak-memory budgets for parsing, grading and report rendering.
+
+Generates a multi-megabyte solution and a slightly flawed attempt, then runs
+each operation under tracemalloc. Peak allocation is checked against a
+budget expressed as a multiple of the input's size, and the largest
+allocation sites still held when the operation returns are listed. Exits
+non-zero when any budget is exceeded.
+
+Grading is slow under tracemalloc (character diffs allocate heavily), so the
+grading and report checks use only the leading blocks of the document, up to
+--grade-megabytes.
+
+    python3 benchmarks/memory.py [--megabytes 4] [--grade-megabytes 0.5] \
+        [--top 5] [--output FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from corpus import CorpusSpec, memorizer, mutate_block, solution_text
+
+DEFAULT_MEGABYTES = 4.0
+DEFAULT_GRADE_MEGABYTES = 0.5
+DEFAULT_TOP = 5
+BLOCK_LINES = 10
+ERROR_RATE = 0.02
+TRACE_FRAMES = 1  # only the allocating line is reported; more frames slow grading
+
+# Peak traced bytes allowed per byte of input text. Inputs are built
+# before tracing starts, so only memory the operation itself allocates counts.
+BUDGETS = {
+    # Block contents are copies of slices of the raw text
+    "parse_markdown": 2.0,
+    # Retains every BlockResult: line lists, opcodes and scores
+    "compare_blocks": 8.0,
+    # One BlockResult alive at a time
+    "iter_compare_blocks": 0.25,
+    # Streams grading and rendering into a sink, as run_drill does
+    "report_streaming": 0.25,
+}
+
+
+class NullWriter:
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def build_inputs(megabytes: float, seed: int) -> tuple[str, memorizer.ParsedMarkdown, str]:
+    rng = random.Random(seed)
+    # solution_text emits roughly 30 bytes per line plus a heading per block
+    blocks = max(1, int(megabytes * 1_000_000 / (BLOCK_LINES * 30 + 30)))
+    text = solution_text(rng, "Memory budget", CorpusSpec(blocks=blocks, lines=BLOCK_LINES), 0)
+    parsed = memorizer.parse_markdown(text)
+    attempt = memorizer.fill_attempt_template(
+        parsed, [mutate_block(rng, b.content, ERROR_RATE) for b in parsed.target_blocks]
+    )
+    return text, parsed, attempt
+
+
+def traced(func: Callable[[], object], top: int) -> dict:
+    """Run func under tracemalloc; report peak bytes and the top retained sites."""
+    tracemalloc.start(TRACE_FRAMES)
+    start = time.perf_counter()
+    try:
+        result = func()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    sites = [
+        {"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "bytes": stat.size}
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+    return {"peak_bytes": peak, "seconds": round(elapsed, 3), "top_sites": sites}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=DEFAULT_MEGABYTES,
+                        help=f"Approximate solution size (default: {DEFAULT_MEGABYTES}).")
+    parser.add_argument("--grade-megabytes", type=float, default=DEFAULT_GRADE_MEGABYTES,
+                        help=f"Input size for the grading checks (default: {DEFAULT_GRADE_MEGABYTES}).")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP,
+                        help=f"Allocation sites to list per check (default: {DEFAULT_TOP}).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    text, parsed, attempt = build_inputs(args.megabytes, args.seed)
+    size = len(text.encode("utf-8"))
+    # Leading blocks that fit in --grade-megabytes (at least one)
+    limit = args.grade_megabytes * 1_000_000
+    count = max(1, sum(1 for b in parsed.target_blocks if b.end_pos <= limit))
+    expected_blocks = parsed.target_blocks[:count]
+    actual_blocks = memorizer.extract_attempt_blocks(attempt)[:count]
+    grade_size = len(text[:expected_blocks[-1].end_pos].encode("utf-8"))
+    solution_path = memorizer.SOLUTIONS_ROOT / "memory-budget.md"
+    attempt_path = memorizer.ATTEMPTS_ROOT / "memory-budget-1.attempt.md"
+
+    def stream_report() -> None:
+        results = memorizer.iter_compare_blocks(expected_blocks, actual_blocks)
+        chunks = memorizer.iter_markdown_report(solution_path, attempt_path, results)
+        memorizer.write_report(chunks, [(NullWriter(), True), (NullWriter(), False)])
+
+    def stream_grades() -> None:
+        for _ in memorizer.iter_compare_blocks(expected_blocks, actual_blocks):
+            pass
+
+    # name -> (operation, bytes of input it covers)
+    checks = {
+        "parse_markdown": (lambda: memorizer.parse_markdown(text), size),
+        "compare_blocks": (
+            lambda: memorizer.compare_blocks(expected_blocks, actual_blocks), grade_size
+        ),
+        "iter_compare_blocks": (stream_grades, grade_size),
+        "report_streaming": (stream_report, grade_size),
+    }
+
+    results = {
+        "document_bytes": size,
+        "blocks": len(parsed.target_blocks),
+        "graded_bytes": grade_size,
+        "graded_blocks": count,
+        "checks": {},
+    }
+    failures = []
+    for name, (func, input_bytes) in checks.items():
+        print(f"Tracing {name}...", file=sys.stderr)
+        measured = traced(func, args.top)
+        measured["budget_bytes"] = int(BUDGETS[name] * input_bytes)
+        measured["ratio"] = round(measured["peak_bytes"] / input_bytes, 3)
+        results["checks"][name] = measured
+        if measured["peak_bytes"] > measured["budget_bytes"]:
+            failures.append(
+                f"{name}: peak {measured['peak_bytes']:,} bytes "
+                f"({measured['ratio']}x) exceeds {BUDGETS[name]}x budget"
+            )
+
+    text_out = json.dumps(results, indent=2)
+    print(text_out)
+    if args.output:
+        args.output.write_text(text_out + "\n", encoding="utf-8")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Replay drills end to end and report per-phase latency percentiles.
+
+Generates a synthetic corpus (see corpus.py) and pre-recorded attempts,
+points $EDITOR at stand_in_editor.sh, and drives run_drill (or
+run_focus_session with --focus) without a terminal. With --nvim-server,
+attempts go through the persistent nvim editor instead, talking to
+stand_in_nvim.sh in place of an nvim client. Every
+--rounds-th attempt of a solution is perfect and the ones before it are
+flawed and retried. Prints p50/p95/p99 in ms for each phase of an attempt
+and their total. The phases are the ones run_drill records with PHASES and
+logs to TIMINGS_LOG_PATH (as shown by --timings), read back from that log.
+
+    python3 benchmarks/replay.py [--cycles 2000] [--focus] [--nvim-server] [--output FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable
+
+from corpus import CorpusSpec, generate_corpus, memorizer, mutate_block
+
+STAND_IN_EDITOR = Path(__file__).resolve().parent / "stand_in_editor.sh"
+STAND_IN_NVIM = Path(__file__).resolve().parent / "stand_in_nvim.sh"
+DEFAULT_CYCLES = 2000
+DEFAULT_ROUNDS = 2
+PERCENTILES = (50, 95, 99)
+
+
+def install() -> Callable[[], None]:
+    """Make the prompts between attempts answer themselves; returns an undo."""
+    original = {
+        name: getattr(memorizer, name)
+        for name in ("prompt_next_action", "prompt_continue_after_perfect")
+    }
+    memorizer.prompt_next_action = lambda *, allow_quit=False: "retry"
+    memorizer.prompt_continue_after_perfect = lambda next_solution: "continue"
+
+    def undo() -> None:
+        for name, func in original.items():
+            setattr(memorizer, name, func)
+    return undo
+
+
+def logged_phase_samples() -> dict[str, list[float]]:
+    """Per-phase samples in ms, plus their total, from each logged attempt."""
+    samples: dict[str, list[float]] = defaultdict(list)
+    with memorizer.TIMINGS_LOG_PATH.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            phases = json.loads(line)["phases_ms"]
+            for name, ms in phases.items():
+                samples[name].append(ms)
+            samples["total"].append(sum(phases.values()))
+    return samples
+
+
+def record_attempts(solution_paths: list[Path], recordings: Path, error_rate: float, seed: int) -> None:
+    """Write each solution's perfect and flawed recording for the stand-in editor."""
+    rng = random.Random(seed)
+    recordings.mkdir()
+    for path in solution_paths:
+        parsed = memorizer.parse_markdown(path.read_text(encoding="utf-8"))
+        perfect = memorizer.fill_attempt_template(parsed, [b.content for b in parsed.target_blocks])
+        flawed = memorizer.fill_attempt_template(
+            parsed, [mutate_block(rng, b.content, error_rate) for b in parsed.target_blocks]
+        )
+        (recordings / f"{path.stem}.perfect.md").write_text(perfect, encoding="utf-8")
+        (recordings / f"{path.stem}.flawed.md").write_text(flawed, encoding="utf-8")
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples: dict[str, list[float]]) -> dict[str, dict[str, float]]:
+    summary = {}
+    for name, values in samples.items():
+        ordered = sorted(values)
+        summary[name] = {"count": len(ordered)}
+        for pct in PERCENTILES:
+            summary[name][f"p{pct}_ms"] = round(percentile(ordered, pct), 3)
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    defaults = CorpusSpec(solutions=50, attempts=0)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES,
+                        help=f"Attempts to replay (default: {DEFAULT_CYCLES}).")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS,
+                        help=f"Attempts per drill; only the last is perfect (default: {DEFAULT_ROUNDS}).")
+    parser.add_argument("--focus", action="store_true",
+                        help="Drive run_focus_session (with prefetch) instead of run_drill.")
+    parser.add_argument("--nvim-server", action="store_true",
+                        help="Edit through the persistent nvim editor, with stand_in_nvim.sh as the client.")
+    parser.add_argument("--solutions", type=int, default=defaults.solutions)
+    parser.add_argument("--blocks", type=int, default=defaults.blocks)
+    parser.add_argument("--lines", type=int, default=defaults.lines)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+    if args.cycles < 1 or args.rounds < 1:
+        memorizer.die("--cycles and --rounds must be at least 1.")
+
+    spec = CorpusSpec(
+        solutions=args.solutions, blocks=args.blocks, lines=args.lines,
+        attempts=0, error_rate=args.error_rate, seed=args.seed,
+    )
+    drills = math.ceil(args.cycles / args.rounds)
+
+    with tempfile.TemporaryDirectory(prefix="memorizer-replay-") as tmp:
+        root = Path(tmp)
+        solution_paths = generate_corpus(root, spec)
+        record_attempts(solution_paths, root / "recordings", args.error_rate, args.seed)
+        os.environ.pop("VISUAL", None)
+        os.environ["EDITOR"] = str(STAND_IN_EDITOR)
+        if args.nvim_server:
+            os.environ[memorizer.NVIM_SERVER_ENV] = str(root / "nvim.sock")
+            os.environ[memorizer.NVIM_CLIENT_ENV] = str(STAND_IN_NVIM)
+        else:
+            os.environ.pop(memorizer.NVIM_SERVER_ENV, None)
+        os.environ["MEMORIZER_REPLAY_DIR"] = str(root / "recordings")
+        os.environ["MEMORIZER_REPLAY_ROUNDS"] = str(args.rounds)
+
+        queue = [solution_paths[i % len(solution_paths)] for i in range(drills)]
+        memorizer.TIMINGS_LOG_PATH.unlink(missing_ok=True)
+        undo = install()
+        try:
+            with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+                if args.focus:
+                    memorizer.run_focus_session(queue, shuffle=False)
+                else:
+                    for path in queue:
+                        memorizer.run_drill(path)
+        finally:
+            undo()
+        samples = logged_phase_samples()
+
+    results = {
+        "python": sys.version.split()[0],
+        "mode": "focus" if args.focus else "drill",
+        "editor": "nvim-server" if args.nvim_server else "subprocess",
+        "spec": vars(spec),
+        "rounds": args.rounds,
+        "phases": summarize(samples),
+    }
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
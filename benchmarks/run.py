@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Time memorizer's parse, template, grade, render, history and summary paths.
+
+Each scale generates a synthetic corpus (see corpus.py) in a temporary
+directory, then times every operation over the whole corpus several times.
+Results are printed and written as JSON; pass an earlier results file as
+--baseline to print how each timing changed.
+
+    python3 benchmarks/run.py [--scales small,medium] [--repeat 5] \\
+        [--output results.json] [--baseline old.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from corpus import CorpusSpec, generate_corpus, memorizer
+
+SCALES: dict[str, CorpusSpec] = {
+    "small": CorpusSpec(solutions=20, blocks=2, lines=20, attempts=3),
+    "medium": CorpusSpec(solutions=200, blocks=3, lines=40, attempts=5),
+    "large": CorpusSpec(solutions=1000, blocks=3, lines=60, attempts=10),
+}
+DEFAULT_SCALES = "small,medium"
+DEFAULT_REPEAT = 5
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict[str, float]:
+    """Run func repeat times and return min and median wall time in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": round(min(samples), 3), "median_ms": round(statistics.median(samples), 3)}
+
+
+def bench_scale(spec: CorpusSpec, repeat: int) -> dict[str, dict[str, float]]:
+    with tempfile.TemporaryDirectory(prefix="memorizer-bench-") as tmp:
+        solution_paths = generate_corpus(Path(tmp), spec)
+        texts = [p.read_text(encoding="utf-8") for p in solution_paths]
+        parsed = [memorizer.parse_markdown(t) for t in texts]
+        # The last attempt of each solution stands in for a fresh one
+        attempt_paths = [
+            memorizer.ATTEMPTS_ROOT / f"{p.stem}-{spec.attempts}.attempt.md" for p in solution_paths
+        ]
+        attempts = [p.read_text(encoding="utf-8") for p in attempt_paths]
+        graded = [memorizer.grade_attempt(s, a) for s, a in zip(parsed, attempts)]
+
+        def render() -> None:
+            for solution, attempt, results in zip(solution_paths, attempt_paths, graded):
+                lines = memorizer.build_markdown_report(solution, attempt, results)
+                memorizer.format_report(lines, ansi=True)
+
+        def summary() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                memorizer.render_summary()
+
+        return {
+            "parse": measure(lambda: [memorizer.parse_markdown(t) for t in texts], repeat),
+            "template": measure(lambda: [memorizer.render_attempt_template(p) for p in parsed], repeat),
+            "grade": measure(
+                lambda: [memorizer.grade_attempt(s, a) for s, a in zip(parsed, attempts)], repeat
+            ),
+            "render": measure(render, repeat),
+            "history": measure(
+                lambda: [memorizer.get_attempt_history(p) for p in solution_paths], repeat
+            ),
+            "summary": measure(summary, repeat),
+        }
+
+
+def print_comparison(results: dict, baseline: dict) -> None:
+    for scale, timings in results["scales"].items():
+        before = baseline.get("scales", {}).get(scale)
+        if before is None:
+            continue
+        print(f"{scale}:")
+        for op, timing in timings.items():
+            old = before.get(op, {}).get("median_ms")
+            if old:
+                ratio = timing["median_ms"] / old
+                print(f"  {op:<10} {old:>10.2f} -> {timing['median_ms']:>10.2f} ms  ({ratio:.2f}x)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        default=DEFAULT_SCALES,
+        help=f"Comma-separated scales from: {', '.join(SCALES)} (default: {DEFAULT_SCALES}).",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"Timed runs per operation (default: {DEFAULT_REPEAT}).")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", type=Path, help="Earlier results file to compare against.")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.scales.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCALES]
+    if unknown:
+        memorizer.die(f"Unknown scale(s): {', '.join(unknown)}")
+
+    results = {
+        "python": sys.version.split()[0],
+        "repeat": args.repeat,
+        "specs": {name: vars(SCALES[name]) for name in names},
+        "scales": {},
+    }
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        results["scales"][name] = bench_scale(SCALES[name], args.repeat)
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    if args.baseline:
+        print_comparison(results, json.loads(args.baseline.read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
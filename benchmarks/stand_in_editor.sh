@@ -0,0 +1,17 @@
+#!/bin/sh
+# Scripted stand-in for $EDITOR used by benchmarks/replay.py.
+#
+# Overwrites the attempt ($1, .../<stem>-<n>.attempt.md) with a recording from
+# $MEMORIZER_REPLAY_DIR: <stem>.perfect.md on every $MEMORIZER_REPLAY_ROUNDS-th
+# attempt, <stem>.flawed.md otherwise. Uses no subshells so the only process
+# started per attempt is cp.
+name=${1##*/}
+name=${name%.attempt.md}
+stem=${name%-*}
+number=${name##*-}
+if [ $((number % MEMORIZER_REPLAY_ROUNDS)) -eq 0 ]; then
+    kind=perfect
+else
+    kind=flawed
+fi
+exec cp "$MEMORIZER_REPLAY_DIR/$stem.$kind.md" "$1"
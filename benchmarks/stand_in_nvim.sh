@@ -0,0 +1,20 @@
+#!/bin/sh
+# Scripted stand-in for the nvim client ($MEMORIZER_NVIM) used by
+# benchmarks/replay.py --nvim-server.
+#
+# Answers the two requests NvimServerEditor sends to a running nvim:
+#   --server ADDR --remote FILE       writes the recording into FILE, as
+#                                     stand_in_editor.sh does, like a :w
+#   --server ADDR --remote-expr EXPR  prints 0: bufloaded() is false because
+#                                     the buffer is closed once written
+# No server runs; ADDR is ignored.
+while [ $# -gt 0 ]; do
+    case $1 in
+        --server) shift 2 ;;
+        --remote) exec "${0%/*}/stand_in_editor.sh" "$2" ;;
+        --remote-expr) echo 0; exit 0 ;;
+        *) echo "stand_in_nvim.sh: unsupported argument '$1'" >&2; exit 2 ;;
+    esac
+done
+echo "stand_in_nvim.sh: nothing to do" >&2
+exit 2
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Startup budget check for memorizer.
+
+Measures what ``import memorizer`` costs (via ``python -X importtime``) and the
+wall-clock time of ``--help`` and ``--summary``, and checks that modules
+deferred to the commands that use them are not loaded at import.
+
+The import budget is relative, so it holds on slow or busy machines. The same
+run also times importing just the standard-library modules memorizer loads
+at import, and memorizer may take at most --max-ratio times as long. Exits
+non-zero when the budget or the deferral check fails.
+
+Everything runs against a copy of the program and solutions/ in a temporary
+directory, so timing --summary does not touch the repository's .cache/ or
+metrics.
+
+    python3 benchmarks/startup.py [--max-ratio 1.75] [--runs 15] [--output FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import py_compile
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MAX_RATIO = 1.75  # currently about 1.2; single noisy runs reach 1.6
+DEFAULT_RUNS = 15
+# What memorizer imports at module level; importing these alone is the
+# baseline its import time is judged against
+BASELINE_MODULES = (
+    "bisect", "contextlib", "heapq", "io", "json", "math", "os", "re", "sys",
+    "time", "pathlib", "typing",
+)
+# Imported inside the functions that need them; loading any of these at
+# import time is a regression
+DEFERRED_MODULES = (
+    "argparse",
+    "concurrent.futures",
+    "curses",
+    "dataclasses",
+    "datetime",
+    "difflib",
+    "numpy",
+    "random",
+    "select",
+    "shlex",
+    "shutil",
+    "socket",
+    "struct",
+    "subprocess",
+)
+
+
+def copy_program(root: Path) -> None:
+    """Copy the launcher, the package (with fresh bytecode) and solutions/ to root."""
+    ignore = shutil.ignore_patterns("__pycache__")
+    shutil.copy2(REPO_ROOT / "memorizer.py", root / "memorizer.py")
+    shutil.copytree(REPO_ROOT / "memorizer", root / "memorizer", ignore=ignore)
+    shutil.copytree(REPO_ROOT / "solutions", root / "solutions", ignore=ignore)
+    # Measure cached-bytecode startup even under PYTHONDONTWRITEBYTECODE
+    module = str(root / "memorizer" / "__init__.py")
+    py_compile.compile(module, cfile=importlib.util.cache_from_source(module))
+
+
+def run_python(root: Path, *args: str) -> subprocess.CompletedProcess[str]:
+    # Metrics go to root's .cache/ rather than a textfile configured for real use
+    env = {k: v for k, v in os.environ.items() if k != "MEMORIZER_METRICS_FILE"}
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_time_ms(root: Path, *modules: str) -> float:
+    """Cumulative import time of modules in one fresh interpreter."""
+    result = run_python(root, "-X", "importtime", "-c", "import " + ", ".join(modules))
+    total = 0.0
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        # Skip the header; nested imports are indented, so count only the
+        # top-level ones
+        if len(fields) == 3 and fields[1].strip().isdigit() and not fields[2].startswith("  "):
+            total += int(fields[1]) / 1000
+    if not total:
+        raise RuntimeError(f"no importtime entries for {modules}")
+    return total
+
+
+def loaded_deferred_modules(root: Path) -> list[str]:
+    code = (
+        "import sys, memorizer; "
+        f"print('\\n'.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    return run_python(root, "-c", code).stdout.split()
+
+
+def command_ms(root: Path, *args: str) -> float:
+    start = time.perf_counter()
+    run_python(root, "memorizer.py", *args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-ratio", type=float, default=DEFAULT_MAX_RATIO,
+                        help="Fail if importing memorizer takes longer than this many times "
+                             f"importing its standard-library modules (default: {DEFAULT_MAX_RATIO}).")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help=f"Fresh interpreters per measurement (default: {DEFAULT_RUNS}).")
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="memorizer-startup-") as tmp:
+        root = Path(tmp)
+        copy_program(root)
+
+        # One discarded pair warms the file cache for both. The fastest run is
+        # the least disturbed by other load on the machine; alternating the
+        # two keeps a burst of load from skewing only one
+        import_time_ms(root, "memorizer")
+        import_time_ms(root, *BASELINE_MODULES)
+        import_runs, baseline_runs = [], []
+        for _ in range(args.runs):
+            import_runs.append(import_time_ms(root, "memorizer"))
+            baseline_runs.append(import_time_ms(root, *BASELINE_MODULES))
+        import_ms, baseline_ms = min(import_runs), min(baseline_runs)
+        ratio = import_ms / baseline_ms
+        results = {
+            "python": sys.version.split()[0],
+            "import_ms": round(import_ms, 2),
+            "baseline_import_ms": round(baseline_ms, 2),
+            "import_ratio": round(ratio, 2),
+            "max_ratio": args.max_ratio,
+            "help_ms": round(statistics.median(command_ms(root, "--help") for _ in range(args.runs)), 2),
+            "summary_ms": round(
+                statistics.median(command_ms(root, "--summary") for _ in range(args.runs)), 2
+            ),
+            "deferred_modules_loaded": loaded_deferred_modules(root),
+        }
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+
+    ok = True
+    if ratio > args.max_ratio:
+        print(
+            f"FAIL: import took {import_ms:.1f} ms, {ratio:.2f}x the {baseline_ms:.1f} ms "
+            f"standard-library baseline; the budget is {args.max_ratio:.2f}x",
+            file=sys.stderr,
+        )
+        ok = False
+    if results["deferred_modules_loaded"]:
+        print(
+            "FAIL: imported at startup: " + ", ".join(results["deferred_modules_loaded"]),
+            file=sys.stderr,
+        )
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
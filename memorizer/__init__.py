@@ -0,0 +1,4458 @@
+"""MEMORIZER CLI tool for practicing code recall.
+
+The grading core (``parse_markdown``, ``render_attempt_template``,
+``compare_blocks``, ``compute_stats`` and the helpers listed in ``__all__``)
+works on plain strings and performs no I/O, so the module can be imported and
+used to grade attempts from other programs.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import heapq
+import io
+import json
+import math
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING, Iterable, Iterator, List, Literal, NamedTuple, NoReturn, Protocol, Sequence,
+    Tuple,
+)
+
+# Modules only some commands need (difflib, subprocess, random, shutil, shlex,
+# datetime, select, struct, concurrent.futures) are imported where they are
+# used, so --help and --summary do not pay for them at startup. argparse is
+# only needed by the CLI, not by programs importing the grading core.
+if TYPE_CHECKING:
+    import argparse
+    from concurrent.futures import Future
+    from datetime import datetime
+
+__all__ = [
+    "CodeBlock",
+    "ParsedMarkdown",
+    "BlockResult",
+    "parse_markdown",
+    "render_attempt_template",
+    "fill_attempt_template",
+    "extract_attempt_blocks",
+    "compare_blocks",
+    "iter_compare_blocks",
+    "compare_block",
+    "normalize_block_lines",
+    "grade_attempt",
+    "compute_line_diff",
+    "compute_stats",
+    "compute_perfect_match",
+    "document_score",
+]
+
+# ==========================================================================
+# CONSTANTS & CONFIGURATION
+# ==========================================================================
+# The repository root. abspath only joins strings; resolve() would stat every
+# path component at import. Code that needs canonical paths resolves them.
+BASE_DIR = Path(os.path.abspath(__file__)).parent.parent
+SOLUTIONS_DIR = Path("solutions")
+ATTEMPTS_DIR = Path("attempts")
+SOLUTIONS_ROOT = BASE_DIR / SOLUTIONS_DIR
+FOCUS_DIR = SOLUTIONS_ROOT / "focus"
+ATTEMPTS_ROOT = BASE_DIR / ATTEMPTS_DIR
+CACHE_DIR = Path(".cache")
+CACHE_ROOT = BASE_DIR / CACHE_DIR
+CATALOG_PATH = CACHE_ROOT / "catalog.json"
+SEARCH_INDEX_PATH = CACHE_ROOT / "search-index.json"
+DAEMON_SOCKET_PATH = CACHE_ROOT / "daemon.sock"
+TIMINGS_LOG_PATH = CACHE_ROOT / "timings.jsonl"
+METRICS_STATE_PATH = CACHE_ROOT / "metrics.json"
+HISTORY_INDEX_PATH = CACHE_ROOT / "history-index.json"
+HISTORY_JOURNAL_PATH = CACHE_ROOT / "history-journal.jsonl"
+HISTORY_LOCK_PATH = CACHE_ROOT / "history.lock"
+ATTEMPT_TABLE_PATH = CACHE_ROOT / "attempt-table.jsonl"
+METRICS_LOCK_PATH = CACHE_ROOT / "metrics.lock"
+METRICS_FILE_ENV = "MEMORIZER_METRICS_FILE"  # textfile path for node-exporter
+DEFAULT_METRICS_FILE = CACHE_ROOT / "metrics.prom"
+DEFAULT_EDITORS: Sequence[str] = ("nvim", "vim", "vi")
+NVIM_SERVER_ENV = "MEMORIZER_NVIM_SERVER"  # --listen address of a running nvim
+NVIM_CLIENT_ENV = "MEMORIZER_NVIM"         # nvim binary used to talk to the server
+NVIM_POLL_INTERVAL = 0.05   # seconds between checks for a write
+NVIM_CLOSE_CHECK_EVERY = 10  # polls between asking the server whether the buffer closed
+WATCH_POLL_INTERVAL = 0.1    # seconds between mtime checks when inotify is unavailable
+TYPING_TAB = "    "          # inserted by Tab in the built-in typing drill
+PREFETCH_DEPTH = 2           # focus-queue solutions prepared ahead of the current drill
+SM2_INITIAL_EASE = 2.5       # SM-2 ease factor of a solution's first review
+SM2_MIN_EASE = 1.3
+REVIEW_NEW_LIMIT = 10        # never-attempted solutions added to each --review session
+SECONDS_PER_DAY = 86400
+HEATMAP_MAX_ROWS = 8         # line ranges per block in the --stats --blocks heatmap
+HEATMAP_WIDTH = 10           # cells in each heatmap bar
+CURVE_ATTEMPTS = 10          # attempt numbers shown in the learning curve
+ROLLING_WINDOW = 20          # attempts averaged per rolling-average point
+ROLLING_POINTS = 8           # rolling-average points shown
+DECAY_GAP_DAYS = (1, 7, 30)  # practice-gap bucket edges for score decay
+STALE_DAYS = 30              # solutions unpracticed this long count as stale
+REGRESSION_MARGIN = 10.0     # points below the previous best that count as a regression
+REGRESSIONS_SHOWN = 10
+SUMMARY_SORTS = ("worst", "stale", "recent")
+SUMMARY_COLLAPSE_THRESHOLD = 10  # unattempted directories larger than this print as one line
+ANSI_RED_BG = "\033[41m"
+ANSI_GREEN_BG = "\033[42m"
+ANSI_RESET = "\033[0m"
+ANSI_BOLD = "\033[1m"
+ANSI_GREEN = "\033[32m"
+ANSI_YELLOW = "\033[33m"
+ANSI_BRIGHT_GREEN = "\033[92m"
+ANSI_BRIGHT_YELLOW = "\033[93m"
+ANSI_DIM = "\033[2m"
+HEADER_RULE = "=" * 40
+INFO_MARKER = "<!-- INFO -->"
+RECORD_VERSION = 1
+METRICS_VERSION = 1
+HISTORY_INDEX_VERSION = 4
+HISTORY_JOURNAL_LIMIT = 200  # journaled attempts before the index is rewritten
+CATALOG_VERSION = 1
+SEARCH_INDEX_VERSION = 1
+DAEMON_PROTOCOL_VERSION = 1
+DAEMON_TIMEOUT = 10.0  # seconds a client waits for the daemon before working locally
+HEADING_WEIGHT = 3  # term weight of headings relative to prose and code
+FINDER_MAX_RESULTS = 10
+WORD_BOUNDARY_CHARS = "/_-. "
+DIFF_CONTEXT_LINES = 3      # unchanged lines shown around each change when collapsed
+COLLAPSE_THRESHOLD_LINES = 40  # blocks longer than this collapse unchanged runs by default
+PERFECT_BANNER: Sequence[str] = (
+    "    ┏━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┓",
+    "    ┃                              ┃",
+    "    ┃    ★  PERFECT RECALL  ★      ┃",
+    "    ┃                              ┃",
+    "    ┗━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┛",
+)
+
+# Report text is built once as lines of (style, text) spans, where style is an
+# ANSI prefix ("" for unstyled), then serialized with or without escapes.
+Span = Tuple[str, str]
+ReportLine = List[Span]
+
+
+class _LazyPattern:
+    """A regex compiled on first use; otherwise behaves like re.Pattern."""
+
+    __slots__ = ("_pattern", "_flags", "_compiled")
+
+    def __init__(self, pattern: str, flags: int = 0) -> None:
+        self._pattern = pattern
+        self._flags = flags
+        self._compiled: re.Pattern[str] | None = None
+
+    def __getattr__(self, name: str):
+        if self._compiled is None:
+            self._compiled = re.compile(self._pattern, self._flags)
+        return getattr(self._compiled, name)
+
+
+# Regex for fenced code blocks: ```lang\ncontent\n```
+CODE_BLOCK_PATTERN = _LazyPattern(
+    r'^```(\w*)\n(.*?)^```',
+    re.MULTILINE | re.DOTALL
+)
+WHITESPACE_PATTERN = _LazyPattern(r"\s")
+SEARCH_TOKEN_PATTERN = _LazyPattern(r"[a-z0-9]{2,}")
+ATTEMPT_NUMBER_PATTERN = _LazyPattern(r"-(\d+)\.attempt\.md$")
+LEGACY_SCORE_PATTERN = _LazyPattern(r"DOCUMENT SCORE:\s+(\d+\.\d+)%")
+
+
+# ==========================================================================
+# MARKDOWN PARSING
+# ==========================================================================
+
+class CodeBlock(NamedTuple):
+    """A fenced code block extracted from markdown."""
+    language: str
+    content: str
+    start_pos: int  # character position in raw text where ``` starts
+    end_pos: int    # character position where closing ``` ends
+    is_target: bool  # True unless preceded by <!-- INFO -->
+
+
+class ParsedMarkdown(NamedTuple):
+    """Result of parsing a markdown file."""
+    raw_text: str
+    blocks: list[CodeBlock]
+    target_blocks: list[CodeBlock]
+
+
+def parse_markdown(text: str) -> ParsedMarkdown:
+    """
+    Extract fenced code blocks from markdown text.
+    
+    Blocks preceded by <!-- INFO --> (within 50 chars) are marked as non-targets.
+    Returns ParsedMarkdown with all blocks and filtered target_blocks.
+    """
+    blocks: list[CodeBlock] = []
+    
+    for match in CODE_BLOCK_PATTERN.finditer(text):
+        language = match.group(1)
+        content = match.group(2)
+        start_pos = match.start()
+        end_pos = match.end()
+        
+        # Check for INFO marker in preceding 50 characters
+        lookback_start = max(0, start_pos - 50)
+        is_target = text.find(INFO_MARKER, lookback_start, start_pos) == -1
+        
+        # Strip trailing newline from content if present
+        if content.endswith('\n'):
+            content = content[:-1]
+        
+        blocks.append(CodeBlock(
+            language=language,
+            content=content,
+            start_pos=start_pos,
+            end_pos=end_pos,
+            is_target=is_target,
+        ))
+    
+    target_blocks = [b for b in blocks if b.is_target]
+    
+    return ParsedMarkdown(
+        raw_text=text,
+        blocks=blocks,
+        target_blocks=target_blocks,
+    )
+
+
+def render_attempt_template(parsed: ParsedMarkdown) -> str:
+    """
+    Generate attempt file content with placeholders for target blocks.
+    
+    Replaces each target block's content with [BLOCK N] placeholder,
+    preserving the fence markers and surrounding markdown.
+    """
+    placeholders = []
+    for block_num, block in enumerate(parsed.target_blocks, 1):
+        line_count = block.content.count('\n') + 1 if block.content else 0
+        lang_str = block.language if block.language else "code"
+        placeholders.append(f"[BLOCK {block_num}] {lang_str} - {line_count} lines")
+    return fill_attempt_template(parsed, placeholders)
+
+
+def fill_attempt_template(parsed: ParsedMarkdown, contents: Sequence[str]) -> str:
+    """
+    Replace the content of each target block with the matching entry of contents.
+
+    Fence markers and surrounding markdown are preserved; target blocks
+    without a matching entry are left unchanged.
+    """
+    raw = parsed.raw_text
+    parts: list[str] = []
+    cursor = 0
+
+    for block, content in zip(parsed.target_blocks, contents):
+        # Format: ```lang\ncontent\n``` spanning start_pos to end_pos.
+        # Content starts after ```lang\n and ends before the closing fence.
+        first_newline = raw.find('\n', block.start_pos, block.end_pos)
+        if first_newline == -1:
+            continue
+        last_fence = raw.rfind('```', block.start_pos, block.end_pos)
+        if last_fence == -1:
+            continue
+
+        parts.append(raw[cursor:first_newline + 1])  # ...```lang\n
+        parts.append(content)
+        parts.append('\n')
+        cursor = last_fence                            # ```...
+
+    parts.append(raw[cursor:])
+    return "".join(parts)
+
+
+class BlockResult(NamedTuple):
+    """Result of comparing a single code block."""
+    block_index: int
+    language: str
+    expected_lines: int
+    actual_lines: int
+    line_accuracy: float
+    char_accuracy: float
+    is_perfect: bool
+    diff_ops: list  # For rendering diffs
+    expected: list[str]
+    actual: list[str]
+
+
+def compare_blocks(
+    expected_blocks: list[CodeBlock],
+    actual_blocks: list[str],
+) -> list[BlockResult]:
+    """
+    Compare expected code blocks against actual attempt blocks.
+    
+    Returns per-block results. Missing actual blocks score 0%.
+    Extra actual blocks are ignored.
+    """
+    return list(iter_compare_blocks(expected_blocks, actual_blocks))
+
+
+def iter_compare_blocks(
+    expected_blocks: Sequence[CodeBlock],
+    actual_blocks: Sequence[str],
+    *,
+    expected_lines: Sequence[list[str]] | None = None,
+) -> Iterator[BlockResult]:
+    """
+    Lazily compare blocks one at a time; see compare_blocks.
+
+    ``expected_lines`` may supply each block's already normalized lines
+    (see normalize_block_lines) to skip re-splitting the solution.
+    """
+    for i, expected_block in enumerate(expected_blocks):
+        actual = actual_blocks[i] if i < len(actual_blocks) else None
+        lines = expected_lines[i] if expected_lines is not None else None
+        yield compare_block(i + 1, expected_block, actual, expected_lines=lines)
+
+
+def normalize_block_lines(content: str) -> list[str]:
+    """Split block content into the lines that are compared."""
+    return strip_trailing_blank_lines(content.splitlines())
+
+
+def compare_block(
+    block_index: int,
+    expected_block: CodeBlock,
+    actual: str | None,
+    *,
+    expected_lines: list[str] | None = None,
+) -> BlockResult:
+    """Compare one expected block with the attempt's content (None if missing)."""
+    if expected_lines is None:
+        expected_lines = normalize_block_lines(expected_block.content)
+    
+    if actual is not None:
+        actual_lines = normalize_block_lines(actual)
+    else:
+        # Missing block
+        actual_lines = []
+    
+    diff_ops = compute_line_diff(expected_lines, actual_lines)
+    stats = compute_stats(diff_ops, expected_lines, actual_lines)
+    is_perfect = compute_perfect_match(diff_ops, stats)
+    
+    return BlockResult(
+        block_index=block_index,
+        language=expected_block.language,
+        expected_lines=len(expected_lines),
+        actual_lines=len(actual_lines),
+        line_accuracy=stats["line_accuracy"],
+        char_accuracy=stats["char_accuracy"],
+        is_perfect=is_perfect,
+        diff_ops=diff_ops,
+        expected=expected_lines,
+        actual=actual_lines,
+    )
+
+
+def extract_attempt_blocks(attempt_text: str) -> list[str]:
+    """Return the contents of the target blocks the user filled in."""
+    # Use target_blocks to match only user-filled blocks (excludes INFO blocks)
+    return [b.content for b in parse_markdown(attempt_text).target_blocks]
+
+
+def grade_attempt(parsed_solution: ParsedMarkdown, attempt_text: str) -> list[BlockResult]:
+    """Grade raw attempt text against a parsed solution."""
+    return compare_blocks(
+        parsed_solution.target_blocks, extract_attempt_blocks(attempt_text)
+    )
+
+
+def document_score(block_results: Sequence[BlockResult]) -> float:
+    """Document score is the minimum block char accuracy (0% with no blocks)."""
+    return min((r.char_accuracy for r in block_results), default=0.0)
+
+
+class Writer(Protocol):
+    def write(self, data: str, /) -> int: ...
+
+    def flush(self) -> None: ...
+
+
+def die(message: str, *, code: int = 2) -> NoReturn:
+    """Print an error message and exit with the provided code."""
+    print(f"ERROR: {message}", file=sys.stderr)
+    raise SystemExit(code)
+
+
+# ==========================================================================
+# CLI ARGUMENTS
+# ==========================================================================
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Practice recalling canonical snippets by typing them from memory "
+            "and reviewing strict diffs."
+        )
+    )
+    parser.add_argument(
+        "solution",
+        nargs="?",
+        help=(
+            "Path to the canonical solution file (relative to repo or absolute). "
+            "If omitted, interactive selection is used."
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Show progress statistics for the selected solution instead of starting a new attempt.",
+    )
+    parser.add_argument(
+        "--blocks",
+        action="store_true",
+        help="With --stats, add per-block accuracy and a heatmap of the line ranges missed most.",
+    )
+    parser.add_argument(
+        "--focus",
+        action="store_true",
+        help="Run drills for every solution under solutions/focus/ in random order.",
+    )
+    parser.add_argument(
+        "--review",
+        action="store_true",
+        help=(
+            "Drill every solution whose spaced-repetition review is due, most overdue "
+            f"first, then up to {REVIEW_NEW_LIMIT} never-attempted ones."
+        ),
+    )
+    parser.add_argument(
+        "--summary",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help=(
+            "Show progress summary for all solutions, or only those under the "
+            "directory PATH (e.g. algorithms/sorting)."
+        ),
+    )
+    parser.add_argument(
+        "--sort",
+        choices=SUMMARY_SORTS,
+        help=(
+            "With --summary, list attempted solutions ranked by lowest latest score "
+            "(worst), oldest practice (stale) or newest practice (recent)."
+        ),
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        metavar="N",
+        help="With --summary, list at most N solutions.",
+    )
+    parser.add_argument(
+        "--analytics",
+        action="store_true",
+        help=(
+            "Show learning-curve analytics across all solutions: rolling averages, "
+            "time to mastery, decay since last practice and regressions."
+        ),
+    )
+    parser.add_argument(
+        "--since",
+        metavar="YYYY-MM-DD",
+        help="With --analytics, only count attempts graded on or after this date.",
+    )
+    parser.add_argument(
+        "--until",
+        metavar="YYYY-MM-DD",
+        help="With --analytics, only count attempts graded on or before this date.",
+    )
+    parser.add_argument(
+        "--search",
+        metavar="QUERY",
+        help=(
+            "Search solution headings, prose and code for QUERY. "
+            "With --focus, drill the matches in ranked order."
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Create the attempt and regrade it on every save, redrawing the report "
+            "here; edit the attempt in another terminal."
+        ),
+    )
+    parser.add_argument(
+        "--type",
+        action="store_true",
+        help=(
+            "Type each block in a built-in full-screen drill with a live accuracy "
+            "figure instead of opening an external editor."
+        ),
+    )
+    parser.add_argument(
+        "--nvim-server",
+        metavar="ADDRESS",
+        help=(
+            "Open attempts in a running 'nvim --listen ADDRESS' instead of starting "
+            f"an editor per attempt (default: ${NVIM_SERVER_ENV})."
+        ),
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            f"Keep the catalog, parsed solutions and attempt history warm and serve "
+            f"--summary, --stats and drill startup over {CACHE_DIR / DAEMON_SOCKET_PATH.name}."
+        ),
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help=(
+            "Print how long each phase (editor, parse, grade, render, write) took "
+            f"after every attempt. Timings are always logged to {CACHE_DIR / TIMINGS_LOG_PATH.name}."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        type=Path,
+        help="Write a cProfile dump of the whole session to PATH (view with 'python3 -m pstats PATH').",
+    )
+    diff_group = parser.add_mutually_exclusive_group()
+    diff_group.add_argument(
+        "--context",
+        type=int,
+        metavar="N",
+        help=(
+            "Collapse unchanged lines in diffs, keeping N lines around each change. "
+            f"By default only blocks over {COLLAPSE_THRESHOLD_LINES} lines are collapsed, "
+            f"with {DIFF_CONTEXT_LINES} lines of context."
+        ),
+    )
+    diff_group.add_argument(
+        "--full-diff",
+        action="store_true",
+        help="Never collapse unchanged lines in diffs.",
+    )
+    return parser.parse_args(argv)
+
+
+# ==========================================================================
+# FILE / PATH UTILITIES
+# ==========================================================================
+
+def validate_solution_path(raw: str) -> Path:
+    """Resolve the canonical solution path, supporting relative inputs."""
+
+    def normalize(candidate: Path) -> Path:
+        try:
+            return candidate.resolve()
+        except OSError:
+            return candidate.absolute()
+
+    candidates: list[Path] = []
+    raw_path = Path(raw).expanduser()
+
+    if raw_path.is_absolute():
+        candidates.append(normalize(raw_path))
+    else:
+        candidates.append(normalize(Path.cwd() / raw_path))
+        candidates.append(normalize(BASE_DIR / raw_path))
+        candidates.append(normalize(BASE_DIR / SOLUTIONS_DIR / raw_path))
+
+    seen: set[Path] = set()
+    for path in candidates:
+        if path in seen:
+            continue
+        seen.add(path)
+        if path.is_file():
+            try:
+                path.open("r", encoding="utf-8").close()
+            except OSError as exc:
+                die(f"Cannot read solution '{path}': {exc}")
+            return path
+
+    search_hint = (SOLUTIONS_ROOT / raw_path.name).resolve()
+    die(
+        f"Solution '{raw}' not found. Expected an existing file such as '{search_hint}'."
+    )
+
+
+class ListingEntry(NamedTuple):
+    """A directory entry as shown by nested navigation."""
+    path: Path
+    is_dir: bool
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+
+# Session cache for nested navigation: directory -> (mtime_ns, entries)
+_LISTING_CACHE: dict[Path, tuple[int, list[ListingEntry]]] = {}
+
+
+def list_contents(directory: Path) -> List[ListingEntry]:
+    """
+    List directories and then files in the given directory.
+
+    Reads the directory once with os.scandir, reusing DirEntry type
+    information, and caches the listing for the session until the
+    directory's mtime changes.
+    """
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return []
+    cached = _LISTING_CACHE.get(directory)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    dirs: list[ListingEntry] = []
+    files: list[ListingEntry] = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    if entry.is_dir():
+                        dirs.append(ListingEntry(Path(entry.path), True))
+                    elif entry.is_file():
+                        files.append(ListingEntry(Path(entry.path), False))
+                except OSError:
+                    continue
+    except OSError:
+        return []
+
+    dirs.sort(key=lambda e: e.name)
+    files.sort(key=lambda e: e.name)
+    entries = dirs + files
+    _LISTING_CACHE[directory] = (mtime_ns, entries)
+    return entries
+
+
+def collect_focus_files() -> list[Path]:
+    """Return readable, non-hidden files in the focus directory (non-recursive)."""
+    if not FOCUS_DIR.exists() or not FOCUS_DIR.is_dir():
+        return []
+
+    files: list[Path] = []
+    for path in FOCUS_DIR.iterdir():
+        if path.name.startswith("."):
+            continue
+        if path.is_file() and os.access(path, os.R_OK):
+            files.append(path.resolve())
+    return sorted(files, key=lambda p: p.name.lower())
+
+
+def _select_nested(start_dir: Path) -> Path:
+    """Prompt user to select a solution from the directory structure using nested navigation."""
+    current_dir = start_dir.resolve()
+    root_dir = SOLUTIONS_ROOT.resolve()
+    parent_entry = ListingEntry(Path(".."), True)
+    listed_dir: Path | None = None
+    display_list: list[ListingEntry] = []
+
+    while True:
+        if listed_dir != current_dir:
+            candidates = list_contents(current_dir)
+            if not candidates and current_dir == root_dir:
+                die(f"No solutions found in {SOLUTIONS_ROOT}")
+            # Add ".." option if not at root
+            display_list = [parent_entry] if current_dir != root_dir else []
+            display_list.extend(candidates)
+            listed_dir = current_dir
+
+        # Calculate relative path for display
+        try:
+            rel_path = current_dir.relative_to(root_dir)
+        except ValueError:
+            rel_path = current_dir.name
+
+        print(f"{ANSI_BOLD}Current directory: {rel_path}{ANSI_RESET}")
+
+        for i, entry in enumerate(display_list, 1):
+            name = entry.name + "/" if entry.is_dir and entry is not parent_entry else entry.name
+            print(f" {i:2}. {name}")
+
+        try:
+            raw = input("\nSelect a solution (number or name): ").strip()
+            if not raw:
+                continue
+
+            selected = None
+
+            # Try number
+            if raw.isdigit():
+                idx = int(raw) - 1
+                if 0 <= idx < len(display_list):
+                    selected = display_list[idx]
+
+            # Try name match
+            if not selected:
+                for entry in display_list:
+                    # Match name exactly (handling the .. special case)
+                    if entry.name == raw:
+                        selected = entry
+                        break
+            
+            if not selected:
+                 print("Invalid selection. Please enter a number or exact filename.")
+                 continue
+
+            # Handle Selection
+            if selected is parent_entry:
+                current_dir = current_dir.parent
+            elif selected.is_dir:
+                current_dir = selected.path
+            else:
+                return selected.path
+
+        except (KeyboardInterrupt, EOFError):
+            print()
+            sys.exit(130)
+
+
+# Last catalog read from disk: (mtime_ns of CATALOG_PATH, catalog), so a
+# long-lived process (see --daemon) only re-stats directories
+_CATALOG_MEMO: tuple[int, dict] | None = None
+
+
+def _load_catalog(root: Path) -> list[str] | None:
+    """Return cached solution paths if no directory under root changed since caching."""
+    global _CATALOG_MEMO
+    try:
+        mtime_ns = os.stat(CATALOG_PATH).st_mtime_ns
+        if _CATALOG_MEMO is not None and _CATALOG_MEMO[0] == mtime_ns:
+            catalog = _CATALOG_MEMO[1]
+        else:
+            with CATALOG_PATH.open("r", encoding="utf-8") as handle:
+                catalog = json.load(handle)
+            _CATALOG_MEMO = (mtime_ns, catalog)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(catalog, dict)
+        or catalog.get("version") != CATALOG_VERSION
+        or catalog.get("root") != str(root)
+    ):
+        return None
+
+    # Adding, removing or renaming an entry bumps its directory's mtime
+    for rel_dir, mtime_ns in catalog["dirs"].items():
+        try:
+            if os.stat(root / rel_dir).st_mtime_ns != mtime_ns:
+                return None
+        except OSError:
+            return None
+    return catalog["files"]
+
+
+def _walk_solution_tree(root: Path, start: str = "") -> Iterator[tuple[str, int, list[str]]]:
+    """
+    Walk the non-hidden tree under root/start depth-first in name order.
+
+    Yields (directory relative to root, its mtime_ns, its files relative to
+    root) for every directory that could be read.
+    """
+    pending = [start]
+    while pending:
+        rel_dir = pending.pop()
+        directory = root / rel_dir if rel_dir else root
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as it:
+                entries = sorted(
+                    (e for e in it if not e.name.startswith(".")), key=lambda e: e.name
+                )
+        except OSError:
+            continue
+
+        batch: list[str] = []
+        subdirs: list[str] = []
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(rel)
+                elif entry.is_file():
+                    batch.append(rel)
+            except OSError:
+                continue
+        # Depth-first in name order
+        pending.extend(reversed(subdirs))
+        yield rel_dir, mtime_ns, batch
+
+
+def _iter_catalog_batches(root: Path) -> Iterator[list[str]]:
+    """
+    Yield solution paths (relative to root, non-hidden) in per-directory batches.
+
+    Uses the cached catalog when it is still valid; otherwise walks the tree
+    with os.scandir, yielding each directory's files as soon as it is read,
+    and refreshes the cache once the walk completes.
+    """
+    cached = _load_catalog(root)
+    if cached is not None:
+        yield cached
+        return
+
+    dirs: dict[str, int] = {}
+    files: list[str] = []
+    for rel_dir, mtime_ns, batch in _walk_solution_tree(root):
+        dirs[rel_dir or "."] = mtime_ns
+        files.extend(batch)
+        if batch:
+            yield batch
+
+    try:
+        CACHE_ROOT.mkdir(exist_ok=True)
+        write_json_atomic(
+            CATALOG_PATH,
+            {"version": CATALOG_VERSION, "root": str(root), "dirs": dirs, "files": files},
+        )
+    except OSError:
+        pass
+
+
+def iter_solution_catalog(root: Path | None = None) -> Iterator[str]:
+    """Yield every solution path relative to SOLUTIONS_ROOT (see _iter_catalog_batches)."""
+    for batch in _iter_catalog_batches((root or SOLUTIONS_ROOT).resolve()):
+        yield from batch
+
+
+def iter_solution_subtree(rel_dir: str) -> Iterator[str]:
+    """
+    Yield solution paths (relative to SOLUTIONS_ROOT) under one directory.
+
+    Walks only that directory, so the cost is proportional to the subtree
+    rather than the whole catalog.
+    """
+    for _, _, batch in _walk_solution_tree(SOLUTIONS_ROOT.resolve(), rel_dir):
+        yield from batch
+
+
+def _select_with_fzf(start_dir: Path) -> Path:
+    """Use fzf to select a solution file, streaming the catalog into it."""
+    import subprocess
+
+    root = SOLUTIONS_ROOT.resolve()
+    
+    # Run fzf with minimal flags
+    cmd = ["fzf", "--height=40%", "--reverse"]
+    
+    try:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    except FileNotFoundError:
+        # fzf binary not found
+        raise ValueError("fzf command not found")
+    
+    # Feed fzf as paths are produced so it renders immediately
+    files: dict[str, Path] = {}
+    assert proc.stdin is not None
+    try:
+        for batch in _iter_catalog_batches(root):
+            for rel in batch:
+                files[rel] = root / rel
+            proc.stdin.write(("\n".join(batch) + "\n").encode("utf-8"))
+            proc.stdin.flush()
+    except BrokenPipeError:
+        # fzf exited (selection made or cancelled) before the walk finished
+        pass
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+    
+    if not files:
+        proc.kill()
+        proc.wait()
+        die(f"No solutions found in {SOLUTIONS_ROOT}")
+    
+    assert proc.stdout is not None
+    stdout = proc.stdout.read()
+    proc.stdout.close()
+    if proc.wait() != 0:
+        # User cancelled (Ctrl-C or Esc)
+        raise SystemExit(130)
+    
+    selected_rel = stdout.decode("utf-8").strip()
+    if not selected_rel:
+        raise ValueError("No selection made")
+    
+    selected = files.get(selected_rel)
+    if selected is None:
+        raise ValueError(f"Selected path '{selected_rel}' not found")
+    return selected
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _subsequence_pattern(term: str) -> re.Pattern[str]:
+    """Regex matching term's characters in order within a single line."""
+    return re.compile("[^\n]*?".join(re.escape(ch) for ch in term))
+
+
+class TrigramIndex:
+    """
+    In-memory fuzzy finder over solution paths.
+
+    Every whitespace-separated query term must appear in the path as a
+    subsequence; paths containing all terms as substrings rank first, then
+    word-boundary and file-name hits, then tighter and shorter matches.
+
+    Substring candidates come from the rarest query trigram's posting list.
+    When they cannot fill the result list, a subsequence regex runs over
+    all paths joined into one string. Its matches are cached so each extra
+    keystroke only re-checks the previous matches.
+    """
+
+    def __init__(self, paths: Sequence[str]) -> None:
+        self.paths = list(paths)
+        self._lowered = [p.lower() for p in self.paths]
+        self._postings: dict[str, list[int]] = {}
+        for doc_id, text in enumerate(self._lowered):
+            for trigram in _trigrams(text):
+                self._postings.setdefault(trigram, []).append(doc_id)
+        self._corpus = "\n".join(self._lowered)
+        self._offsets: list[int] = []
+        offset = 0
+        for text in self._lowered:
+            self._offsets.append(offset)
+            offset += len(text) + 1
+        self._last_query = ""
+        self._last_matches: list[int] | None = None
+
+    def search(self, query: str, *, limit: int = FINDER_MAX_RESULTS) -> list[str]:
+        """Return the best ``limit`` paths matching every term of the query."""
+        terms = query.lower().split()
+        if not terms:
+            self._last_query, self._last_matches = "", None
+            return self.paths[:limit]
+        patterns = [_subsequence_pattern(t) for t in terms]
+
+        candidates = self._substring_matches(terms)
+        if candidates is None or len(candidates) < limit:
+            # Extending the query can only narrow its matches
+            pool = None
+            if self._last_matches is not None and query.startswith(self._last_query):
+                pool = self._last_matches
+            candidates = self._subsequence_matches(patterns, pool)
+            self._last_query, self._last_matches = query, candidates
+
+        def rank(doc_id: int) -> tuple[bool, int, int, int, int]:
+            text = self._lowered[doc_id]
+            name_start = text.rfind("/") + 1
+            contiguous = True
+            bonus = span = 0
+            for term, pattern in zip(terms, patterns):
+                pos = text.find(term)
+                if pos == -1:
+                    contiguous = False
+                    match = pattern.search(text)
+                    assert match is not None
+                    pos = match.start()
+                    span += match.end() - pos
+                else:
+                    span += len(term)
+                if pos == 0 or text[pos - 1] in WORD_BOUNDARY_CHARS:
+                    bonus += 1
+                if pos >= name_start:
+                    bonus += 1
+            return (not contiguous, -bonus, span, len(text), doc_id)
+
+        return [self.paths[d] for d in heapq.nsmallest(limit, candidates, key=rank)]
+
+    def _substring_matches(self, terms: list[str]) -> list[int] | None:
+        """Paths containing every term verbatim, or None if a term is too short to index."""
+        if any(len(t) < 3 for t in terms):
+            return None
+        rarest: list[int] | None = None
+        for term in terms:
+            for trigram in _trigrams(term):
+                posting = self._postings.get(trigram, [])
+                if rarest is None or len(posting) < len(rarest):
+                    rarest = posting
+        assert rarest is not None
+        lowered = self._lowered
+        return [d for d in rarest if all(t in lowered[d] for t in terms)]
+
+    def _subsequence_matches(
+        self, patterns: list[re.Pattern[str]], pool: list[int] | None
+    ) -> list[int]:
+        lowered = self._lowered
+        if pool is None:
+            # One C-level scan over every path, then map offsets back to paths
+            pool = []
+            last = -1
+            for match in patterns[0].finditer(self._corpus):
+                doc_id = bisect.bisect_right(self._offsets, match.start()) - 1
+                if doc_id != last:
+                    pool.append(doc_id)
+                    last = doc_id
+            patterns = patterns[1:]
+        return [d for d in pool if all(p.search(lowered[d]) for p in patterns)]
+
+
+def _read_key(fd: int) -> str:
+    """Read one keypress (possibly a multi-byte escape sequence) from a raw terminal."""
+    data = os.read(fd, 32)
+    return data.decode("utf-8", errors="ignore")
+
+
+def _select_with_finder(start_dir: Path) -> Path:
+    """Select a solution with the built-in fuzzy finder in a raw-mode terminal."""
+    if not (sys.stdin.isatty() and sys.stdout.isatty()):
+        raise ValueError("built-in finder needs an interactive terminal")
+    try:
+        import termios
+        import tty
+    except ImportError:
+        raise ValueError("built-in finder needs a POSIX terminal")
+    import shutil
+
+    root = SOLUTIONS_ROOT.resolve()
+    index = TrigramIndex(list(iter_solution_catalog(root)))
+    if not index.paths:
+        die(f"No solutions found in {SOLUTIONS_ROOT}")
+
+    height = max(1, min(FINDER_MAX_RESULTS, shutil.get_terminal_size().lines - 2))
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    query = ""
+    cursor = 0
+    matches = index.search(query, limit=height)
+    out = sys.stdout
+
+    def draw() -> None:
+        parts = ["\r\x1b[J", f"{ANSI_BOLD}> {ANSI_RESET}{query}"]
+        for row, rel in enumerate(matches):
+            if row == cursor:
+                parts.append(f"\r\n{ANSI_BOLD}{ANSI_BRIGHT_GREEN}▌ {rel}{ANSI_RESET}")
+            else:
+                parts.append(f"\r\n  {rel}")
+        parts.append(f"\r\n{ANSI_DIM}  {len(matches)} shown / {len(index.paths)} solutions{ANSI_RESET}")
+        # Return the cursor to the end of the query line
+        parts.append(f"\x1b[{len(matches) + 1}A\r\x1b[{len(query) + 3}G")
+        out.write("".join(parts))
+        out.flush()
+
+    try:
+        tty.setraw(fd)
+        while True:
+            draw()
+            key = _read_key(fd)
+            if key in ("\r", "\n"):
+                if matches:
+                    return root / matches[cursor]
+                continue
+            if key in ("\x03", "\x1b"):
+                raise SystemExit(130)
+            if key in ("\x1b[A", "\x10"):  # Up / Ctrl-P
+                cursor = max(0, cursor - 1)
+                continue
+            if key in ("\x1b[B", "\x0e"):  # Down / Ctrl-N
+                cursor = min(len(matches) - 1, cursor + 1) if matches else 0
+                continue
+            if key in ("\x7f", "\x08"):
+                query = query[:-1]
+            elif key == "\x15":  # Ctrl-U
+                query = ""
+            elif key.isprintable():
+                query += key
+            else:
+                continue
+            matches = index.search(query, limit=height)
+            cursor = 0
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+        out.write("\r\x1b[J")
+        out.flush()
+
+
+def interactive_select(start_dir: Path) -> Path:
+    """Select a solution file: fzf, else the built-in finder, else nested navigation."""
+    import shutil
+    import subprocess
+
+    if shutil.which("fzf"):
+        try:
+            return _select_with_fzf(start_dir)
+        except (subprocess.SubprocessError, ValueError):
+            print("fzf selection failed; falling back")
+    try:
+        return _select_with_finder(start_dir)
+    except ValueError:
+        print("Using nested navigation (install fzf or use a terminal for fuzzy selection)")
+    return _select_nested(start_dir)
+
+
+def get_next_attempt_path(solution_path: Path) -> Path:
+    """Determine the next numbered attempt filename for the solution."""
+    ATTEMPTS_ROOT.mkdir(exist_ok=True)
+    basename = solution_path.stem or solution_path.name
+    
+    suffix = ".attempt.md"
+    pattern = f"{basename}-*.attempt.md"
+    # Match basename-N where N is a number, before .attempt.md
+    regex = re.compile(rf"{re.escape(basename)}-(\d+)\.attempt$")
+
+    highest = 0
+    for path in ATTEMPTS_ROOT.glob(pattern):
+        match = regex.search(path.stem)
+        if match:
+            highest = max(highest, int(match.group(1)))
+
+    next_number = highest + 1
+    return ATTEMPTS_ROOT / f"{basename}-{next_number}{suffix}"
+
+
+# ==========================================================================
+# EDITOR MANAGEMENT
+# ==========================================================================
+
+def detect_editor() -> List[str]:
+    """Resolve the editor command via $VISUAL, $EDITOR, then fallbacks."""
+    import shlex
+    import shutil
+
+    visual = os.environ.get("VISUAL")
+    editor = os.environ.get("EDITOR")
+
+    for candidate in (visual, editor):
+        if candidate:
+            tokens = shlex.split(candidate)
+            if tokens:
+                return tokens
+
+    for name in DEFAULT_EDITORS:
+        if shutil.which(name):
+            return [name]
+
+    die(
+        "No editor detected. Set $VISUAL or $EDITOR, or install one of: "
+        + ", ".join(DEFAULT_EDITORS)
+    )
+
+
+def launch_editor(editor_cmd: Sequence[str], attempt_path: Path) -> None:
+    """Open the attempt file in the detected editor and block until exit."""
+    import subprocess
+
+    cmd = [*editor_cmd, str(attempt_path)]
+    try:
+        subprocess.run(cmd, check=True)
+    except FileNotFoundError:
+        die(f"Editor command '{cmd[0]}' not found in PATH.")
+    except subprocess.CalledProcessError as exc:
+        die(f"Editor exited with code {exc.returncode}.")
+    except OSError as exc:
+        die(f"Failed to launch editor: {exc}")
+
+
+class Editor(Protocol):
+    def edit(self, attempt_path: Path, solution: ParsedMarkdown) -> None: ...
+
+
+class SubprocessEditor:
+    """Run the editor command as a fresh blocking process for each attempt."""
+
+    def __init__(self, editor_cmd: Sequence[str]) -> None:
+        self.editor_cmd = list(editor_cmd)
+
+    def edit(self, attempt_path: Path, solution: ParsedMarkdown) -> None:
+        launch_editor(self.editor_cmd, attempt_path)
+
+
+class NvimServerEditor:
+    """
+    Open attempts in an already running ``nvim --listen ADDRESS``.
+
+    Each attempt is opened as a new buffer through ``nvim --server ADDRESS
+    --remote``. The attempt counts as finished when the file is written or
+    its buffer is closed, so the editor never has to start up again.
+    """
+
+    def __init__(self, address: str, *, nvim: str = "nvim") -> None:
+        self.address = address
+        self.nvim = nvim
+
+    def _remote(self, *args: str) -> str:
+        import subprocess
+
+        cmd = [self.nvim, "--server", self.address, *args]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5, check=True)
+        except FileNotFoundError:
+            die(f"Editor command '{self.nvim}' not found in PATH.")
+        except (subprocess.SubprocessError, OSError) as exc:
+            die(f"Cannot reach nvim server at '{self.address}': {exc}")
+        return result.stdout.strip()
+
+    def _buffer_loaded(self, attempt_path: Path) -> bool:
+        quoted = str(attempt_path).replace("'", "''")
+        return self._remote("--remote-expr", f"bufloaded('{quoted}')") != "0"
+
+    def open(self, attempt_path: Path) -> None:
+        """Open the attempt in the server without waiting for it."""
+        self._remote("--remote", str(attempt_path))
+
+    def edit(self, attempt_path: Path, solution: ParsedMarkdown) -> None:
+        def signature() -> tuple[int, int]:
+            st = attempt_path.stat()
+            return st.st_mtime_ns, st.st_size
+
+        before = signature()
+        self.open(attempt_path)
+        print(
+            f"{ANSI_DIM}Editing {attempt_path.name} in nvim at {self.address}; "
+            f"write (:w) or close the buffer to grade.{ANSI_RESET}",
+            flush=True,
+        )
+        polls = 0
+        try:
+            while True:
+                time.sleep(NVIM_POLL_INTERVAL)
+                if signature() != before:
+                    return
+                polls += 1
+                if polls % NVIM_CLOSE_CHECK_EVERY == 0 and not self._buffer_loaded(attempt_path):
+                    return
+        except OSError as exc:
+            die(f"Lost attempt file '{attempt_path}': {exc}")
+        except KeyboardInterrupt:
+            print()
+            raise SystemExit(130)
+
+
+class LiveScore:
+    """
+    Running char accuracy for a block being typed, updated line by line.
+
+    Typed line i is scored against expected line i (whitespace ignored) and
+    per-line match counts are cached. Editing one line costs one short
+    SequenceMatcher run on that line. Splitting or joining lines rescores
+    only the lines from the edit onwards. compare_blocks stays the
+    authority for the final grade.
+    """
+
+    def __init__(self, expected: Sequence[str]) -> None:
+        self._expected = [WHITESPACE_PATTERN.sub("", line) for line in expected]
+        self.total = sum(len(line) for line in self._expected)
+        self._matched: list[int] = []
+        self._sum = 0
+
+    def _line_matches(self, index: int, text: str) -> int:
+        if index >= len(self._expected):
+            return 0
+        typed = WHITESPACE_PATTERN.sub("", text)
+        expected = self._expected[index]
+        if typed == expected:
+            return len(expected)
+        from difflib import SequenceMatcher
+
+        matcher = SequenceMatcher(a=expected, b=typed, autojunk=False)
+        return sum(size for _, _, size in matcher.get_matching_blocks())
+
+    def update(self, index: int, text: str) -> None:
+        """Rescore one edited line."""
+        matched = self._line_matches(index, text)
+        self._sum += matched - self._matched[index]
+        self._matched[index] = matched
+
+    def resync(self, start: int, lines: Sequence[str]) -> None:
+        """Rescore every line from start after lines were split or joined."""
+        self._sum -= sum(self._matched[start:])
+        del self._matched[start:]
+        for index in range(start, len(lines)):
+            matched = self._line_matches(index, lines[index])
+            self._matched.append(matched)
+            self._sum += matched
+
+    @property
+    def accuracy(self) -> float:
+        if self.total == 0:
+            return 100.0
+        return self._sum / self.total * 100
+
+
+class TypingEditor:
+    """
+    Built-in curses drill: type each target block below its surrounding prose.
+
+    Ctrl-D (or F2) finishes the current block, Tab inserts four spaces and
+    Esc finishes the attempt early, leaving remaining blocks as placeholders.
+    The typed blocks are written into the attempt file for normal grading.
+    """
+
+    def edit(self, attempt_path: Path, solution: ParsedMarkdown) -> None:
+        if not (sys.stdin.isatty() and sys.stdout.isatty()):
+            die("--type needs an interactive terminal.")
+        try:
+            import curses
+        except ImportError:
+            die("--type needs the curses module, which is unavailable here.")
+
+        try:
+            text = attempt_path.read_text(encoding="utf-8")
+        except OSError as exc:
+            die(f"Cannot read attempt '{attempt_path}': {exc}")
+        parsed_attempt = parse_markdown(text)
+        targets = parsed_attempt.target_blocks
+        contents: list[str] = []
+
+        def session(stdscr) -> None:
+            cursor = 0
+            for k, block in enumerate(targets):
+                expected = solution.target_blocks[k] if k < len(solution.target_blocks) else block
+                context = text[cursor:block.start_pos].splitlines()
+                cursor = block.end_pos
+                lang = block.language or "code"
+                title = f"BLOCK {k + 1}/{len(targets)} ({lang})"
+                typed = _type_block(
+                    curses,
+                    stdscr,
+                    context,
+                    title,
+                    strip_trailing_blank_lines(expected.content.splitlines()),
+                )
+                if typed is None:
+                    return
+                contents.append("\n".join(typed))
+
+        try:
+            curses.wrapper(session)
+        except KeyboardInterrupt:
+            raise SystemExit(130)
+
+        contents.extend(b.content for b in targets[len(contents):])
+        try:
+            attempt_path.write_text(fill_attempt_template(parsed_attempt, contents), encoding="utf-8")
+        except OSError as exc:
+            die(f"Failed to write attempt '{attempt_path}': {exc}")
+
+
+def _type_block(
+    curses,
+    stdscr,
+    context: list[str],
+    title: str,
+    expected: list[str],
+) -> list[str] | None:
+    """Edit one block in curses; returns its lines, or None if the user pressed Esc."""
+    lines = [""]
+    row = col = 0
+    score = LiveScore(expected)
+    score.resync(0, lines)
+    gutter = 6
+
+    while True:
+        height, width = stdscr.getmaxyx()
+        stdscr.erase()
+        context_rows = min(len(context), max(0, (height - 4) // 3))
+        for y, line in enumerate(context[len(context) - context_rows:]):
+            stdscr.addnstr(y, 0, line, width - 1, curses.A_DIM)
+        header = f"{title}  {len(expected)} lines  live: {score.accuracy:5.1f}%"
+        stdscr.addnstr(context_rows, 0, header, width - 1, curses.A_BOLD)
+
+        top = context_rows + 1
+        edit_rows = max(1, height - top - 1)
+        offset = max(0, row - edit_rows + 1)
+        for y, index in enumerate(range(offset, min(len(lines), offset + edit_rows))):
+            stdscr.addnstr(top + y, 0, f"{index + 1:>4}  {lines[index]}", width - 1)
+        stdscr.addnstr(
+            height - 1, 0, "Ctrl-D: next block   Tab: 4 spaces   Esc: finish attempt",
+            width - 1, curses.A_DIM,
+        )
+        stdscr.move(top + row - offset, min(gutter + col, width - 1))
+        stdscr.refresh()
+
+        key = stdscr.get_wch()
+        line = lines[row]
+        if key in ("\x04", curses.KEY_F2):
+            while len(lines) > 1 and not lines[-1].strip():
+                lines.pop()
+            return lines
+        if key == "\x1b":
+            return None
+        if key in ("\n", "\r", curses.KEY_ENTER):
+            lines[row:row + 1] = [line[:col], line[col:]]
+            score.resync(row, lines)
+            row, col = row + 1, 0
+        elif key in ("\x7f", "\x08", curses.KEY_BACKSPACE):
+            if col > 0:
+                lines[row] = line[:col - 1] + line[col:]
+                col -= 1
+                score.update(row, lines[row])
+            elif row > 0:
+                col = len(lines[row - 1])
+                lines[row - 1:row + 1] = [lines[row - 1] + line]
+                row -= 1
+                score.resync(row, lines)
+        elif key == curses.KEY_LEFT:
+            col = max(0, col - 1)
+        elif key == curses.KEY_RIGHT:
+            col = min(len(line), col + 1)
+        elif key == curses.KEY_UP and row > 0:
+            row -= 1
+            col = min(col, len(lines[row]))
+        elif key == curses.KEY_DOWN and row < len(lines) - 1:
+            row += 1
+            col = min(col, len(lines[row]))
+        elif isinstance(key, str) and (key == "\t" or key.isprintable()):
+            insert = TYPING_TAB if key == "\t" else key
+            lines[row] = line[:col] + insert + line[col:]
+            col += len(insert)
+            score.update(row, lines[row])
+
+
+def nvim_server_editor(nvim_server: str | None = None) -> NvimServerEditor | None:
+    """Return an editor for the configured nvim server, or None if there is none."""
+    address = nvim_server or os.environ.get(NVIM_SERVER_ENV)
+    if not address:
+        return None
+    return NvimServerEditor(address, nvim=os.environ.get(NVIM_CLIENT_ENV, "nvim"))
+
+
+def make_editor(nvim_server: str | None = None, *, typing: bool = False) -> Editor:
+    """
+    Pick the session's editor: the built-in typing mode when requested, the
+    nvim server when one is configured, else a per-attempt editor process.
+    """
+    if typing:
+        return TypingEditor()
+    return nvim_server_editor(nvim_server) or SubprocessEditor(detect_editor())
+
+
+def strip_trailing_blank_lines(lines: List[str]) -> List[str]:
+    """Remove trailing blank lines from a list of lines.
+
+    Returns the input list itself when there is nothing to strip.
+    """
+    end = len(lines)
+    while end and not lines[end - 1].strip():
+        end -= 1
+    return lines if end == len(lines) else lines[:end]
+
+
+# ==========================================================================
+# DIFF COMPUTATION
+# ==========================================================================
+
+def compute_line_diff(expected: Sequence[str], actual: Sequence[str]):
+    """Return line-level diff opcodes using difflib.SequenceMatcher."""
+    from difflib import SequenceMatcher
+
+    matcher = SequenceMatcher(a=expected, b=actual, autojunk=False)
+    return matcher.get_opcodes()
+
+
+def render_char_diff(expected: str, actual: str) -> tuple[list[Span], list[Span]]:
+    """Split two strings into spans, highlighting the characters that differ."""
+    from difflib import SequenceMatcher
+
+    matcher = SequenceMatcher(a=expected, b=actual, autojunk=False)
+    expected_spans: list[Span] = []
+    actual_spans: list[Span] = []
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        exp_segment = expected[i1:i2]
+        act_segment = actual[j1:j2]
+
+        if tag == "equal":
+            expected_spans.append(("", exp_segment))
+            actual_spans.append(("", act_segment))
+        elif tag == "delete":
+            expected_spans.append((ANSI_RED_BG, exp_segment))
+        elif tag == "insert":
+            actual_spans.append((ANSI_GREEN_BG, act_segment))
+        elif tag == "replace":
+            expected_spans.append((ANSI_RED_BG, exp_segment))
+            actual_spans.append((ANSI_GREEN_BG, act_segment))
+
+    return expected_spans, actual_spans
+
+
+# ==========================================================================
+# PHASE TIMING
+# ==========================================================================
+
+class PhaseTimer:
+    """
+    Wall time per named phase of a drill.
+
+    Phases may nest; time is exclusive, so an inner phase pauses the one
+    around it. Used from the main thread only.
+    """
+
+    def __init__(self) -> None:
+        self.totals: dict[str, float] = {}
+        self._stack: list[list] = []  # [name, resumed_at] of each open phase
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self.totals[outer[0]] = self.totals.get(outer[0], 0.0) + now - outer[1]
+        entry = [name, now]
+        self._stack.append(entry)
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._stack.pop()
+            self.totals[name] = self.totals.get(name, 0.0) + now - entry[1]
+            if self._stack:
+                self._stack[-1][1] = now
+
+    def iter(self, name: str, iterable: Iterable):
+        """Yield from iterable, timing only the work of producing each item."""
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def reset(self) -> dict[str, float]:
+        """Return the totals in seconds and start over."""
+        totals, self.totals = self.totals, {}
+        return totals
+
+
+PHASES = PhaseTimer()
+
+
+def format_timings(timings: dict[str, float]) -> str:
+    parts = [f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items()]
+    parts.append(f"total {sum(timings.values()) * 1000:.1f} ms")
+    return f"{ANSI_DIM}Timings: {' · '.join(parts)}{ANSI_RESET}"
+
+
+def log_timings(solution_path: Path, attempt_path: Path, timings: dict[str, float]) -> None:
+    """Append one attempt's phase timings to TIMINGS_LOG_PATH (best effort)."""
+    entry = {
+        "time": time.time(),
+        "solution": solution_relative_name(solution_path),
+        "attempt": attempt_path.name,
+        "phases_ms": {name: round(seconds * 1000, 3) for name, seconds in timings.items()},
+    }
+    try:
+        CACHE_ROOT.mkdir(exist_ok=True)
+        with TIMINGS_LOG_PATH.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+    except OSError:
+        pass
+
+
+# ==========================================================================
+# METRICS
+# ==========================================================================
+
+# name -> (type, help, histogram bucket upper bounds)
+METRIC_DEFINITIONS: dict[str, tuple[str, str, tuple[float, ...]]] = {
+    "memorizer_attempts_graded_total": ("counter", "Attempts graded.", ()),
+    "memorizer_grade_seconds": (
+        "histogram",
+        "Time spent grading one attempt.",
+        (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+    ),
+    "memorizer_attempt_file_bytes": (
+        "histogram",
+        "Size of graded attempt files, including the appended report.",
+        (1024, 4096, 16384, 65536, 262144, 1048576),
+    ),
+    "memorizer_history_scan_seconds": (
+        "histogram",
+        "Time spent loading attempt history for --stats, --summary or --analytics.",
+        (0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+    ),
+}
+
+
+class Metrics:
+    """
+    Counter and histogram updates made by this process.
+
+    flush() merges them into the totals kept in METRICS_STATE_PATH and
+    rewrites the Prometheus textfile, so values accumulate across runs.
+    Series are keyed by metric name plus rendered labels.
+    """
+
+    def __init__(self) -> None:
+        self.counters: dict[str, float] = {}
+        self.histograms: dict[str, dict] = {}
+
+    @staticmethod
+    def _series(name: str, labels: dict[str, str] | None) -> str:
+        if not labels:
+            return name
+        rendered = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+        return f"{name}{{{rendered}}}"
+
+    def inc(self, name: str, labels: dict[str, str] | None = None, value: float = 1) -> None:
+        series = self._series(name, labels)
+        self.counters[series] = self.counters.get(series, 0) + value
+
+    def observe(self, name: str, value: float, labels: dict[str, str] | None = None) -> None:
+        bounds = METRIC_DEFINITIONS[name][2]
+        series = self._series(name, labels)
+        hist = self.histograms.setdefault(
+            series, {"buckets": [0] * len(bounds), "sum": 0.0, "count": 0}
+        )
+        # Buckets are stored non-cumulatively and summed when rendering
+        index = bisect.bisect_left(bounds, value)
+        if index < len(bounds):
+            hist["buckets"][index] += 1
+        hist["sum"] += value
+        hist["count"] += 1
+
+    def merge_into(self, state: dict) -> dict:
+        counters = state.setdefault("counters", {})
+        for series, value in self.counters.items():
+            counters[series] = counters.get(series, 0) + value
+        histograms = state.setdefault("histograms", {})
+        for series, hist in self.histograms.items():
+            total = histograms.setdefault(
+                series, {"buckets": [0] * len(hist["buckets"]), "sum": 0.0, "count": 0}
+            )
+            if len(total["buckets"]) != len(hist["buckets"]):
+                total["buckets"] = [0] * len(hist["buckets"])  # bucket layout changed
+            total["buckets"] = [a + b for a, b in zip(total["buckets"], hist["buckets"])]
+            total["sum"] += hist["sum"]
+            total["count"] += hist["count"]
+        self.counters.clear()
+        self.histograms.clear()
+        return state
+
+    def flush(self) -> None:
+        """Persist pending updates and rewrite the textfile (best effort)."""
+        if not self.counters and not self.histograms:
+            return
+        try:
+            CACHE_ROOT.mkdir(exist_ok=True)
+            with METRICS_LOCK_PATH.open("a") as lock:
+                try:
+                    import fcntl
+
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                except ImportError:
+                    pass  # no advisory locks; concurrent runs may drop an update
+                try:
+                    with METRICS_STATE_PATH.open("r", encoding="utf-8") as handle:
+                        state = json.load(handle)
+                except (OSError, ValueError):
+                    state = {}
+                if not isinstance(state, dict) or state.get("version") != METRICS_VERSION:
+                    state = {"version": METRICS_VERSION}
+                state = self.merge_into(state)
+                write_json_atomic(METRICS_STATE_PATH, state)
+                write_text_atomic(metrics_file_path(), render_metrics(state))
+        except OSError as exc:
+            print(f"{ANSI_YELLOW}Warning: cannot write metrics: {exc}{ANSI_RESET}", file=sys.stderr)
+
+
+METRICS = Metrics()
+
+
+def metrics_file_path() -> Path:
+    return Path(os.environ.get(METRICS_FILE_ENV) or DEFAULT_METRICS_FILE)
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Like write_json_atomic, for text; scrapers never see a partial file."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _metric_number(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def render_metrics(state: dict) -> str:
+    """Render accumulated state in the Prometheus text exposition format."""
+    lines: list[str] = []
+    counters = state.get("counters", {})
+    histograms = state.get("histograms", {})
+    for name, (kind, help_text, bounds) in METRIC_DEFINITIONS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for series, value in sorted(counters.items()):
+                if series == name or series.startswith(name + "{"):
+                    lines.append(f"{series} {_metric_number(value)}")
+            continue
+        for series, hist in sorted(histograms.items()):
+            base, _, labels = series.partition("{")
+            if base != name:
+                continue
+            labels = labels.rstrip("}")
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip(bounds, hist["buckets"]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{prefix}le="{_metric_number(bound)}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {hist["count"]}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{name}_sum{suffix} {_metric_number(hist['sum'])}")
+            lines.append(f"{name}_count{suffix} {hist['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def record_graded_attempt(attempt_path: Path, perfect: bool) -> None:
+    """Count a stored attempt and observe its file size."""
+    METRICS.inc("memorizer_attempts_graded_total", {"perfect": "true" if perfect else "false"})
+    try:
+        METRICS.observe("memorizer_attempt_file_bytes", attempt_path.stat().st_size)
+    except OSError:
+        pass
+
+
+# ==========================================================================
+# OUTPUT RENDERING & STATS
+# ==========================================================================
+
+def compute_stats(
+    diff_ops, expected: Sequence[str], actual: Sequence[str]
+) -> dict:
+    """Compute summary statistics. Returns the stats dict."""
+    from difflib import SequenceMatcher
+
+    total_expected = len(expected)
+    total_actual = len(actual)
+    matching_lines = changed_lines = deleted_lines = inserted_lines = 0
+    for tag, i1, i2, j1, j2 in diff_ops:
+        if tag == "equal":
+            matching_lines += i2 - i1
+        elif tag == "replace":
+            changed_lines += i2 - i1
+        elif tag == "delete":
+            deleted_lines += i2 - i1
+        elif tag == "insert":
+            inserted_lines += j2 - j1
+
+    # Character accuracy ignoring whitespace
+    expected_no_ws = WHITESPACE_PATTERN.sub('', "".join(expected))
+    actual_no_ws = WHITESPACE_PATTERN.sub('', "".join(actual))
+    matcher = SequenceMatcher(a=expected_no_ws, b=actual_no_ws, autojunk=False)
+    matching_chars = sum(size for _, _, size in matcher.get_matching_blocks())
+    total_expected_chars = len(expected_no_ws)
+
+    def percentage(match: int, total: int, *, zero_case: float = 100.0) -> float:
+        if total == 0:
+            return zero_case
+        return (match / total) * 100
+
+    line_accuracy = percentage(
+        matching_lines,
+        total_expected,
+        zero_case=100.0 if total_actual == 0 else 0.0,
+    )
+    char_accuracy = percentage(
+        matching_chars,
+        total_expected_chars,
+        zero_case=100.0 if len(actual_no_ws) == 0 else 0.0,
+    )
+
+    return {
+        "total_expected_lines": total_expected,
+        "total_actual_lines": total_actual,
+        "matching_lines": matching_lines,
+        "changed_lines": changed_lines,
+        "deleted_lines": deleted_lines,
+        "inserted_lines": inserted_lines,
+        "line_accuracy": line_accuracy,
+        "matching_chars": matching_chars,
+        "total_expected_chars": total_expected_chars,
+        "char_accuracy": char_accuracy,
+    }
+
+
+def append_report_to_attempt(
+    attempt_path: Path,
+    chunks: Iterable[Sequence[ReportLine]],
+    *,
+    echo: Writer | None = None,
+) -> None:
+    """
+    Stream report chunks into the attempt file as plain text.
+
+    When ``echo`` is given, each chunk is also written there with ANSI styling
+    before the next one is produced.
+    """
+    try:
+        with attempt_path.open("a", encoding="utf-8") as handle:
+            handle.write("\n")
+            sinks: list[tuple[Writer, bool]] = [(handle, False)]
+            if echo is not None:
+                sinks.insert(0, (echo, True))
+            write_report(chunks, sinks)
+    except OSError as exc:
+        die(f"Failed to append report to '{attempt_path}': {exc}")
+
+
+def attempt_record_path(attempt_path: Path) -> Path:
+    """Return the sidecar JSON path for an attempt (``x-3.attempt.md`` -> ``x-3.attempt.json``)."""
+    return attempt_path.with_name(attempt_path.name.removesuffix(".md") + ".json")
+
+
+def solution_relative_name(solution_path: Path) -> str:
+    """Return the solution path relative to SOLUTIONS_ROOT when possible."""
+    try:
+        return str(solution_path.relative_to(SOLUTIONS_ROOT))
+    except ValueError:
+        pass
+    # Resolved paths under a symlinked checkout only match the resolved root
+    try:
+        return str(solution_path.relative_to(SOLUTIONS_ROOT.resolve()))
+    except ValueError:
+        return str(solution_path)
+
+
+def missed_line_ranges(diff_ops) -> list[list[int]]:
+    """Expected-line ranges ([start, end), 0-based) not reproduced exactly."""
+    ranges: list[list[int]] = []
+    for tag, i1, i2, _, _ in diff_ops:
+        if tag == "equal" or i1 == i2:
+            continue
+        if ranges and ranges[-1][1] == i1:
+            ranges[-1][1] = i2
+        else:
+            ranges.append([i1, i2])
+    return ranges
+
+
+def summarize_block(result: BlockResult) -> dict:
+    """Reduce a block result to the scores kept in the attempt record."""
+    return {
+        "index": result.block_index,
+        "language": result.language,
+        "expected_lines": result.expected_lines,
+        "actual_lines": result.actual_lines,
+        "line_accuracy": result.line_accuracy,
+        "char_accuracy": result.char_accuracy,
+        "perfect": result.is_perfect,
+        "missed_lines": missed_line_ranges(result.diff_ops),
+    }
+
+
+def build_attempt_record(
+    solution_path: Path,
+    attempt_path: Path,
+    blocks: Sequence[dict],
+    *,
+    started_at: float,
+    graded_at: float,
+) -> dict:
+    """Build the machine-readable record from summarize_block() entries."""
+    match = ATTEMPT_NUMBER_PATTERN.search(attempt_path.name)
+    return {
+        "version": RECORD_VERSION,
+        "solution": solution_relative_name(solution_path),
+        "attempt": attempt_path.name,
+        "number": int(match.group(1)) if match else 0,
+        "started_at": started_at,
+        "graded_at": graded_at,
+        "document_score": min((b["char_accuracy"] for b in blocks), default=0.0),
+        "perfect": all(b["perfect"] for b in blocks),
+        "blocks": list(blocks),
+    }
+
+
+def write_json_atomic(path: Path, data: dict) -> None:
+    """Write JSON via a temporary file and rename so readers never see partial data."""
+    # One encode and one write; json.dump issues a write per token
+    write_text_atomic(path, json.dumps(data, separators=(",", ":")))
+
+
+def write_attempt_record(attempt_path: Path, record: dict) -> None:
+    """Store the attempt record as a sidecar JSON file next to the attempt."""
+    try:
+        write_json_atomic(attempt_record_path(attempt_path), record)
+    except OSError as exc:
+        die(f"Failed to write attempt record for '{attempt_path}': {exc}")
+
+
+def read_attempt_record(attempt_path: Path) -> dict | None:
+    """Load an attempt's sidecar record, or None if it is missing or unreadable."""
+    try:
+        with attempt_record_path(attempt_path).open("r", encoding="utf-8") as handle:
+            record = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def compute_perfect_match(diff_ops, stats: dict) -> bool:
+    """Determine if the attempt is a perfect match."""
+    differences_found = any(tag != "equal" for tag, *_ in diff_ops)
+    return (
+        not differences_found
+        and stats["total_expected_lines"] == stats["total_actual_lines"]
+        and stats["matching_chars"] == stats["total_expected_chars"]
+    )
+
+
+class DiffView(NamedTuple):
+    """How much unchanged code to show around differences in a block diff."""
+    context: int = DIFF_CONTEXT_LINES
+    collapse_above: int | None = COLLAPSE_THRESHOLD_LINES  # None = never collapse
+
+    def collapses(self, result: BlockResult) -> bool:
+        return self.collapse_above is not None and result.expected_lines > self.collapse_above
+
+
+def _equal_run_lines(
+    result: BlockResult,
+    i1: int,
+    i2: int,
+    *,
+    context: int | None,
+    leading: bool,
+    trailing: bool,
+) -> list[ReportLine]:
+    """Render a run of unchanged lines, folding its middle when context is set."""
+    if context is None:
+        return [[("", f"    {idx + 1:>4}  {result.expected[idx]}")] for idx in range(i1, i2)]
+
+    head_end = i1 if leading else min(i2, i1 + context)
+    tail_start = i2 if trailing else max(head_end, i2 - context)
+    hidden = tail_start - head_end
+    if hidden <= 1:
+        # Folding a single line saves nothing
+        head_end, tail_start, hidden = i2, i2, 0
+
+    lines: list[ReportLine] = [
+        [("", f"    {idx + 1:>4}  {result.expected[idx]}")] for idx in range(i1, head_end)
+    ]
+    if hidden:
+        plural = "s" if hidden != 1 else ""
+        lines.append([(ANSI_DIM, f"    {'':>4}  ⋯ {hidden} unchanged line{plural}")])
+    lines.extend(
+        [("", f"    {idx + 1:>4}  {result.expected[idx]}")] for idx in range(tail_start, i2)
+    )
+    return lines
+
+
+def format_report(lines: Sequence[ReportLine], *, ansi: bool) -> str:
+    """Serialize report lines, with ANSI styling or as plain text."""
+    parts: list[str] = []
+    for line in lines:
+        for style, text in line:
+            if ansi and style:
+                parts.append(style)
+                parts.append(text)
+                parts.append(ANSI_RESET)
+            else:
+                parts.append(text)
+        parts.append("\n")
+    return "".join(parts)
+
+
+def write_report(
+    chunks: Iterable[Sequence[ReportLine]],
+    sinks: Sequence[tuple[Writer, bool]],
+) -> None:
+    """
+    Serialize report chunks to each (stream, ansi) sink as they are produced.
+
+    Each chunk goes out in one write per sink, so nothing waits for the rest
+    of the report.
+    """
+    for chunk in chunks:
+        for out, ansi in sinks:
+            out.write(format_report(chunk, ansi=ansi))
+            out.flush()
+
+
+def iter_markdown_report(
+    solution_path: Path,
+    attempt_path: Path,
+    block_results: Iterable[BlockResult],
+    *,
+    view: DiffView = DiffView(),
+) -> Iterator[list[ReportLine]]:
+    """
+    Generate the report lazily: the header, one chunk per block, then the summary.
+
+    ``block_results`` may itself be lazy (see iter_compare_blocks); each block
+    is graded, rendered and released before the next one is touched.
+    Imperfect blocks longer than ``view.collapse_above`` lines show only
+    ``view.context`` unchanged lines around each change.
+    """
+    yield [
+        [("", HEADER_RULE)],
+        [(ANSI_BOLD, "MEMORIZATION CHECK:"), ("", f" {solution_path.name}")],
+        [("", f"Attempt: {attempt_path.name}")],
+        [("", HEADER_RULE)],
+        [],
+    ]
+
+    min_accuracy: float | None = None
+    num_blocks = 0
+    all_perfect = True
+
+    for result in block_results:
+        num_blocks += 1
+        all_perfect = all_perfect and result.is_perfect
+        if min_accuracy is None or result.char_accuracy < min_accuracy:
+            min_accuracy = result.char_accuracy
+        yield _block_report_lines(result, view)
+
+    # Document summary
+    lines: list[ReportLine] = [
+        [("", HEADER_RULE)],
+        [("", f"DOCUMENT SCORE: {min_accuracy or 0.0:.1f}% (min of {num_blocks} block{'s' if num_blocks != 1 else ''})")],
+        [("", HEADER_RULE)],
+    ]
+    if all_perfect:
+        # Celebratory banner for perfect recall
+        lines.append([])
+        lines.extend([(ANSI_BOLD, row)] for row in PERFECT_BANNER)
+        lines.append([])
+    yield lines
+
+
+def build_markdown_report(
+    solution_path: Path,
+    attempt_path: Path,
+    block_results: Iterable[BlockResult],
+    *,
+    view: DiffView = DiffView(),
+) -> list[ReportLine]:
+    """Build the complete report as a single list of styled lines."""
+    return [
+        line
+        for chunk in iter_markdown_report(solution_path, attempt_path, block_results, view=view)
+        for line in chunk
+    ]
+
+
+def _block_report_lines(result: BlockResult, view: DiffView) -> list[ReportLine]:
+    """Render one block's score line and, if imperfect, its diff."""
+    lang_str = result.language if result.language else "code"
+    if result.is_perfect:
+        status = (ANSI_GREEN, "✓")
+        accuracy = (ANSI_GREEN, "100.0%")
+    else:
+        status = (ANSI_YELLOW, "✗")
+        accuracy = (ANSI_YELLOW, f"{result.char_accuracy:.1f}%")
+
+    lines: list[ReportLine] = [[
+        ("", f"BLOCK {result.block_index} ({lang_str}, {result.expected_lines} lines):  "),
+        status,
+        ("", " "),
+        accuracy,
+    ]]
+
+    # Show diff for imperfect blocks
+    if not result.is_perfect:
+        lines.append([])
+        context = view.context if view.collapses(result) else None
+        last_op = len(result.diff_ops) - 1
+        for op_index, (tag, i1, i2, j1, j2) in enumerate(result.diff_ops):
+            if tag == "equal":
+                lines.extend(_equal_run_lines(
+                    result,
+                    i1,
+                    i2,
+                    context=context,
+                    leading=op_index == 0,
+                    trailing=op_index == last_op,
+                ))
+            elif tag == "replace":
+                exp_block = result.expected[i1:i2]
+                act_block = result.actual[j1:j2]
+                max_block = max(len(exp_block), len(act_block))
+                for offset in range(max_block):
+                    exp_line = exp_block[offset] if offset < len(exp_block) else ""
+                    act_line = act_block[offset] if offset < len(act_block) else ""
+                    exp_spans, act_spans = render_char_diff(exp_line, act_line)
+                    if offset < len(exp_block):
+                        lines.append([("", f"   -{i1 + offset + 1:>4}  "), *exp_spans])
+                    if offset < len(act_block):
+                        lines.append([("", f"   +{j1 + offset + 1:>4}  "), *act_spans])
+            elif tag == "delete":
+                for idx in range(i1, i2):
+                    exp_spans, _ = render_char_diff(result.expected[idx], "")
+                    lines.append([("", f"   -{idx + 1:>4}  "), *exp_spans])
+            elif tag == "insert":
+                for idx in range(j1, j2):
+                    _, act_spans = render_char_diff("", result.actual[idx])
+                    lines.append([("", f"   +{idx + 1:>4}  "), *act_spans])
+    lines.append([])
+    return lines
+
+
+def show_solution_pager(content: List[str]) -> None:
+    """Display the solution content in a pager."""
+    import shlex
+    import subprocess
+
+    if not content:
+        print("No solution content to display.")
+        return
+
+    text = "\n".join(content)
+    pager_cmd = os.environ.get("PAGER", "less -r")
+
+    try:
+        subprocess.run(
+            shlex.split(pager_cmd),
+            input=text.encode("utf-8"),
+            check=True,
+        )
+    except (subprocess.SubprocessError, OSError):
+        # Fallback to printing if pager fails
+        print(text)
+
+
+def prompt_next_action(*, allow_quit: bool = False) -> str:
+    """
+    Prompt user for the next action.
+    Returns: 'retry', 'stop', 'peek', or 'quit'.
+    """
+    while True:
+        try:
+            if allow_quit:
+                prompt = "Action? [Y(retry)/n(skip)/p(peek)/q(quit session)] "
+            else:
+                prompt = "Action? [Y(retry)/n(stop)/p(peek)] "
+            response = input(prompt).strip().lower()
+            if response == "" or response == "y":
+                return "retry"
+            elif response == "n":
+                return "stop"
+            elif response == "p":
+                return "peek"
+            elif allow_quit and response in {"q", "quit"}:
+                return "quit"
+            else:
+                print("Please enter Y, n, p", end="")
+                if allow_quit:
+                    print(", or q")
+                else:
+                    print()
+        except KeyboardInterrupt:
+            print()
+            raise SystemExit(130)
+        except EOFError:
+            print()
+            return "stop"
+
+
+def prompt_continue_after_perfect(next_solution: Path | None) -> Literal["continue", "quit"]:
+    """
+    Prompt user after perfect recall to continue with next solution or quit.
+    Returns: 'continue' or 'quit'.
+    """
+    while True:
+        try:
+            if next_solution is not None:
+                prompt = f"Next solution: {ANSI_BOLD}{ANSI_BRIGHT_GREEN}{next_solution.name}{ANSI_RESET}\nContinue? [Y(continue)/q(quit)] "
+                response = input(prompt).strip().lower()
+                if response == "" or response == "y":
+                    return "continue"
+                elif response in {"q", "quit"}:
+                    return "quit"
+                else:
+                    print("Please enter Y or q")
+            else:
+                # All solutions completed - any input exits successfully
+                input("All solutions completed! Press Enter to exit. ")
+                return "continue"
+        except KeyboardInterrupt:
+            print()
+            raise SystemExit(130)
+        except EOFError:
+            print()
+            return "quit"
+
+
+def create_attempt_file(solution_path: Path, template: str) -> Path:
+    """Create the next numbered attempt file pre-filled with the template."""
+    # Atomic file creation to handle concurrent processes
+    max_retries = 100
+    for _ in range(max_retries):
+        attempt = get_next_attempt_path(solution_path)
+        try:
+            # "x" mode: exclusive creation, fails if file exists
+            with attempt.open("x", encoding="utf-8") as f:
+                f.write(template)
+            return attempt
+        except FileExistsError:
+            # Another process created this file, retry with next number
+            continue
+    die(f"Failed to create attempt file after {max_retries} retries")
+
+
+class PreparedDrill(NamedTuple):
+    """Everything a drill needs from its solution before the editor opens."""
+    solution_path: Path
+    parsed: ParsedMarkdown
+    template: str
+    expected_lines: list[list[str]]  # normalized lines of each target block
+    peek_content: list[str]
+
+
+def prepare_drill(solution_path: Path) -> PreparedDrill:
+    """
+    Read and parse a solution and precompute its template and peek text.
+
+    Raises OSError or UnicodeDecodeError if the file cannot be read and
+    ValueError if it has no target blocks, so it can run off the main thread.
+    """
+    solution_text = solution_path.read_text(encoding="utf-8")
+    parsed = parse_markdown(solution_text)
+    if not parsed.target_blocks:
+        raise ValueError(f"No target code blocks found in '{solution_path}'")
+
+    peek_content = []
+    for i, block in enumerate(parsed.target_blocks, 1):
+        lang = block.language if block.language else "code"
+        peek_content.append(f"=== BLOCK {i} ({lang}) ===")
+        peek_content.append(block.content)
+        peek_content.append("")
+
+    return PreparedDrill(
+        solution_path=solution_path,
+        parsed=parsed,
+        template=render_attempt_template(parsed),
+        expected_lines=[normalize_block_lines(b.content) for b in parsed.target_blocks],
+        peek_content=peek_content,
+    )
+
+
+def run_drill(
+    solution_path: Path,
+    *,
+    allow_quit: bool = False,
+    view: DiffView = DiffView(),
+    editor: Editor | None = None,
+    prepared: PreparedDrill | None = None,
+    show_timings: bool = False,
+) -> Literal["perfect", "stopped", "quit"]:
+    """
+    Run drill loop for markdown solutions with multi-block support.
+
+    Each attempt's phase timings are appended to TIMINGS_LOG_PATH and, with
+    show_timings, printed after its report.
+    """
+    if editor is None:
+        editor = make_editor()
+    
+    PHASES.reset()
+    if prepared is None:
+        try:
+            with PHASES.phase("load"):
+                prepared = load_drill(solution_path)
+        except (OSError, UnicodeDecodeError, ValueError) as exc:
+            die(str(exc))
+    parsed_solution = prepared.parsed
+    
+    def fresh_attempt() -> Path:
+        # Validate the history index while the attempts directory still
+        # matches it; a new attempt file would force a full rebuild
+        history_index()
+        with PHASES.phase("create_attempt"):
+            return create_attempt_file(solution_path, prepared.template)
+    
+    attempt_path = fresh_attempt()
+    
+    while True:
+        started_at = time.time()
+        with PHASES.phase("editor"):
+            editor.edit(attempt_path, parsed_solution)
+        
+        # Parse attempt file
+        with PHASES.phase("parse"):
+            attempt_text = attempt_path.read_text(encoding="utf-8")
+            actual_contents = extract_attempt_blocks(attempt_text)
+        
+        # Warn if block count mismatch
+        expected_count = len(parsed_solution.target_blocks)
+        actual_count = len(actual_contents)
+        if actual_count > expected_count:
+            print(
+                f"{ANSI_YELLOW}Warning: Found {actual_count} code blocks, "
+                f"expected {expected_count}. Ignoring extra blocks.{ANSI_RESET}"
+            )
+        
+        # Grade, render and append block by block; only the scores are kept
+        blocks: list[dict] = []
+
+        def graded() -> Iterator[BlockResult]:
+            for result in PHASES.iter("grade", iter_compare_blocks(
+                parsed_solution.target_blocks,
+                actual_contents,
+                expected_lines=prepared.expected_lines,
+            )):
+                blocks.append(summarize_block(result))
+                yield result
+
+        # Always show the report (includes celebration banner if perfect)
+        with PHASES.phase("write"):
+            append_report_to_attempt(
+                attempt_path,
+                PHASES.iter(
+                    "render",
+                    iter_markdown_report(solution_path, attempt_path, graded(), view=view),
+                ),
+                echo=sys.stdout,
+            )
+        with PHASES.phase("record"):
+            record = build_attempt_record(
+                solution_path,
+                attempt_path,
+                blocks,
+                started_at=started_at,
+                graded_at=time.time(),
+            )
+            store_attempt_record(attempt_path, record)
+        all_perfect = record["perfect"]
+
+        timings = PHASES.reset()
+        log_timings(solution_path, attempt_path, timings)
+        METRICS.observe("memorizer_grade_seconds", timings.get("grade", 0.0))
+        record_graded_attempt(attempt_path, all_perfect)
+        if show_timings:
+            print(format_timings(timings))
+        
+        if all_perfect:
+            return "perfect"
+        
+        action = prompt_next_action(allow_quit=allow_quit)
+        if action == "stop":
+            return "stopped"
+        if action == "quit":
+            return "quit"
+        if action == "peek":
+            # Show all target blocks
+            show_solution_pager(prepared.peek_content)
+            attempt_path = fresh_attempt()
+            continue
+        if action == "retry":
+            attempt_path = fresh_attempt()
+            continue
+
+
+def run_focus_session(
+    files: list[Path],
+    *,
+    view: DiffView = DiffView(),
+    shuffle: bool = True,
+    editor: Editor | None = None,
+    show_timings: bool = False,
+) -> int:
+    """
+    Run focus drills sequentially, honoring quit requests with exit code 2.
+
+    While one drill is in the editor, the next PREFETCH_DEPTH solutions are
+    prepared on a background thread. Solutions that fail to load are
+    announced as soon as the failure is known and skipped when reached.
+    """
+    if not files:
+        return 0
+
+    if editor is None:
+        editor = make_editor()
+    queue = files[:]
+    if shuffle:
+        import random
+
+        random.shuffle(queue)
+    total = len(queue)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memorizer-prefetch")
+    futures: dict[int, Future[PreparedDrill]] = {}
+    announced: set[int] = set()
+
+    def prefetch(start: int) -> None:
+        for j in range(start, min(total, start + PREFETCH_DEPTH + 1)):
+            if j not in futures:
+                futures[j] = pool.submit(load_drill, queue[j])
+
+    def announce_failures() -> None:
+        for j, future in sorted(futures.items()):
+            if j in announced or not future.done() or future.exception() is None:
+                continue
+            announced.add(j)
+            print(
+                f"{ANSI_YELLOW}Warning: cannot load {queue[j].name}: "
+                f"{future.exception()} (it will be skipped){ANSI_RESET}"
+            )
+
+    try:
+        for idx, solution_path in enumerate(queue, start=1):
+            prefetch(idx - 1)
+            try:
+                prepared = futures.pop(idx - 1).result()
+            except (OSError, UnicodeDecodeError, ValueError) as exc:
+                if idx - 1 not in announced:
+                    print(f"{ANSI_YELLOW}Warning: cannot load {solution_path.name}: {exc}{ANSI_RESET}")
+                print(f"[{idx}/{total}] {solution_path.name} (skipped)")
+                continue
+
+            print(f"[{idx}/{total}] {solution_path.name}")
+            outcome = run_drill(
+                solution_path,
+                allow_quit=True,
+                view=view,
+                editor=editor,
+                prepared=prepared,
+                show_timings=show_timings,
+            )
+            announce_failures()
+            if outcome == "quit":
+                return 2
+            elif outcome == "stopped":
+                print("(Skipping this snippet, moving to next...)")
+            elif outcome == "perfect":
+                # After perfect recall, show celebration and prompt for next action
+                print()  # Add spacing after celebration message
+                next_idx = idx  # Current index (0-based after enumerate)
+                next_solution = queue[next_idx] if next_idx < len(queue) else None
+                action = prompt_continue_after_perfect(next_solution)
+                if action == "quit":
+                    return 2
+                # Continue to next iteration
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return 0
+
+
+# ==========================================================================
+# WATCH MODE
+# ==========================================================================
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+
+
+class FileWatcher:
+    """
+    Block until a file's contents change.
+
+    Watches the file's directory with inotify (via ctypes) so editors that
+    save by renaming a new file into place are seen too. Falls back to mtime
+    polling where inotify is unavailable.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._signature = self._stat()
+        self._fd = self._init_inotify()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _init_inotify(self) -> int | None:
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            import ctypes
+            import ctypes.util
+
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+            if libc.inotify_add_watch(fd, os.fsencode(self.path.parent), mask) < 0:
+                os.close(fd)
+                return None
+        except (OSError, AttributeError):
+            return None
+        return fd
+
+    def _saw_event(self, timeout: float) -> bool:
+        """Wait up to timeout for an inotify event naming our file."""
+        import select
+        import struct
+
+        assert self._fd is not None
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+        data = os.read(self._fd, 64 * 1024)
+        name = os.fsencode(self.path.name)
+        offset = 0
+        while offset + 16 <= len(data):
+            _, _, _, name_len = struct.unpack_from("iIII", data, offset)
+            event_name = data[offset + 16:offset + 16 + name_len].rstrip(b"\0")
+            if event_name == name:
+                return True
+            offset += 16 + name_len
+        return False
+
+    def wait(self) -> None:
+        """Return once the file's mtime or size differs from the last call."""
+        while True:
+            if self._fd is not None:
+                # Timeout is only a safety net for missed events
+                self._saw_event(1.0)
+            else:
+                time.sleep(WATCH_POLL_INTERVAL)
+            signature = self._stat()
+            if signature is not None and signature != self._signature:
+                self._signature = signature
+                return
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def run_watch(
+    solution_path: Path,
+    *,
+    view: DiffView = DiffView(),
+    editor: NvimServerEditor | None = None,
+) -> Literal["perfect", "stopped"]:
+    """
+    Regrade an attempt on every save and redraw the report.
+
+    Only blocks whose content changed since the previous save are compared
+    again. The final report and record are stored when recall is perfect
+    or the watch is interrupted.
+    """
+    from datetime import datetime
+
+    try:
+        prepared = load_drill(solution_path)
+    except (OSError, UnicodeDecodeError, ValueError) as exc:
+        die(str(exc))
+    parsed_solution = prepared.parsed
+
+    history_index()  # see run_drill
+    attempt_path = create_attempt_file(solution_path, prepared.template)
+    started_at = time.time()
+    if editor is not None:
+        editor.open(attempt_path)
+    print(
+        f"Watching {attempt_path}\n"
+        "Edit it in your editor; every save is graded. Ctrl-C to stop."
+    )
+
+    graded: dict[int, tuple[str | None, BlockResult]] = {}
+    results: list[BlockResult] = []
+    watcher = FileWatcher(attempt_path)
+    try:
+        while True:
+            watcher.wait()
+            try:
+                actual_contents = extract_attempt_blocks(attempt_path.read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError):
+                continue  # mid-save; the next event will catch up
+
+            # Graded into a separate list so an interrupt mid-grade keeps
+            # the last complete results rather than storing a partial set
+            regraded = 0
+            current: list[BlockResult] = []
+            grade_started = time.perf_counter()
+            for i, expected_block in enumerate(parsed_solution.target_blocks):
+                actual = actual_contents[i] if i < len(actual_contents) else None
+                cached = graded.get(i)
+                if cached is None or cached[0] != actual:
+                    cached = (
+                        actual,
+                        compare_block(
+                            i + 1,
+                            expected_block,
+                            actual,
+                            expected_lines=prepared.expected_lines[i],
+                        ),
+                    )
+                    graded[i] = cached
+                    regraded += 1
+                current.append(cached[1])
+            results = current
+            METRICS.observe("memorizer_grade_seconds", time.perf_counter() - grade_started)
+
+            status = (
+                f"{ANSI_DIM}{datetime.now().strftime('%H:%M:%S')}  "
+                f"regraded {regraded}/{len(results)} blocks  (Ctrl-C to stop){ANSI_RESET}"
+            )
+            report = build_markdown_report(solution_path, attempt_path, results, view=view)
+            sys.stdout.write("\x1b[H\x1b[2J" + status + "\n" + format_report(report, ansi=True))
+            sys.stdout.flush()
+            if all(r.is_perfect for r in results):
+                break
+    except KeyboardInterrupt:
+        print()
+        if not results:
+            return "stopped"
+    finally:
+        watcher.close()
+
+    append_report_to_attempt(
+        attempt_path, iter_markdown_report(solution_path, attempt_path, results, view=view)
+    )
+    store_attempt_record(
+        attempt_path,
+        build_attempt_record(
+            solution_path,
+            attempt_path,
+            [summarize_block(r) for r in results],
+            started_at=started_at,
+            graded_at=time.time(),
+        ),
+    )
+    perfect = all(r.is_perfect for r in results)
+    record_graded_attempt(attempt_path, perfect)
+    return "perfect" if perfect else "stopped"
+
+
+# ==========================================================================
+# STATS & HISTORY
+# ==========================================================================
+
+def _backfill_legacy_record(attempt_path: Path, number: int, solution: str) -> dict | None:
+    """
+    Build a record for an attempt graded before sidecar records existed.
+
+    Recovers the final DOCUMENT SCORE from the stored report and saves the
+    result so later reads go through the record like every other attempt.
+    """
+    try:
+        content = attempt_path.read_text(encoding="utf-8")
+        graded_at = attempt_path.stat().st_mtime
+    except OSError:
+        return None
+
+    scores = LEGACY_SCORE_PATTERN.findall(content)
+    if not scores:
+        return None
+    score = float(scores[-1])
+
+    record = {
+        "version": RECORD_VERSION,
+        "solution": solution,
+        "attempt": attempt_path.name,
+        "number": number,
+        "started_at": graded_at,
+        "graded_at": graded_at,
+        "document_score": score,
+        "perfect": score == 100.0,
+        "blocks": [],
+        "legacy": True,
+    }
+    try:
+        write_json_atomic(attempt_record_path(attempt_path), record)
+    except OSError:
+        pass
+    return record
+
+
+def _claim_legacy_records(records: dict[Path, dict | None]) -> list[dict]:
+    """
+    Name the solution of attempts graded by older versions.
+
+    Maps each attempt (to its record, or None when it has none yet) to the
+    solution whose stem starts the attempt's name, backfilling or rewriting
+    its record. Stems shared by several solutions are ambiguous and left
+    alone; get_attempt_history claims those when one of them is viewed.
+    Returns the records that now name a solution.
+    """
+    stems: dict[str, str | None] = {}
+    for rel in iter_solution_catalog():
+        if rel.endswith(".md"):
+            stem = rel.rsplit("/", 1)[-1][:-3]
+            stems[stem] = None if stem in stems else rel
+
+    claimed = []
+    for path, record in records.items():
+        match = ATTEMPT_NUMBER_PATTERN.search(path.name)
+        solution = stems.get(path.name[: match.start()]) if match else None
+        if solution is None:
+            continue
+        if record is None:
+            record = _backfill_legacy_record(path, int(match.group(1)), solution)
+            if record is None:
+                continue  # never graded
+        else:
+            record["solution"] = solution
+            try:
+                write_json_atomic(attempt_record_path(path), record)
+            except OSError:
+                pass
+        claimed.append(record)
+    return claimed
+
+
+def history_item(record: dict, attempt_path: Path) -> dict:
+    """Convert an attempt record into a history entry."""
+    score = record["document_score"]
+    blocks = record.get("blocks") or []
+    return {
+        "number": record["number"],
+        "timestamp": record["graded_at"],
+        "line_acc": min((b["line_accuracy"] for b in blocks), default=score),
+        "char_acc": score,
+        "perfect": record["perfect"],
+        "blocks": blocks,
+        "review": record.get("review"),
+        "path": attempt_path,
+    }
+
+
+def get_attempt_history(solution_path: Path) -> List[dict]:
+    """Load attempt history for the given solution from attempt records."""
+    global _HISTORY_INDEX
+    basename = solution_path.stem or solution_path.name
+    solution = solution_relative_name(solution_path)
+
+    pattern = f"{basename}-*.attempt.md"
+    name_regex = re.compile(rf"{re.escape(basename)}-(\d+)\.attempt\.md$")
+
+    attempts = []
+    for path in ATTEMPTS_ROOT.glob(pattern):
+        # Ensure strict naming convention match to avoid partial prefix matches
+        match = name_regex.search(path.name)
+        if not match:
+            continue
+
+        record = read_attempt_record(path)
+        if record is None:
+            record = _backfill_legacy_record(path, int(match.group(1)), solution)
+            if record is None:
+                # Never graded (e.g. editor aborted)
+                continue
+            _HISTORY_INDEX = None  # reloaded with the new record
+        elif not record.get("solution"):
+            # Legacy record that rebuild could not claim (ambiguous stem)
+            record["solution"] = solution
+            try:
+                write_json_atomic(attempt_record_path(path), record)
+                _HISTORY_INDEX = None
+            except OSError:
+                pass
+        elif record["solution"] != solution:
+            # Same stem, different solution (e.g. a.md in two directories)
+            continue
+        attempts.append(history_item(record, path))
+
+    return sorted(attempts, key=lambda x: x["number"])
+
+
+def render_stats(solution_path: Path, history: List[dict]) -> None:
+    """Print a history table and summary stats."""
+    from datetime import datetime
+
+    print(HEADER_RULE)
+    print(f"{ANSI_BOLD}HISTORY:{ANSI_RESET} {solution_path.name}")
+    print(HEADER_RULE)
+
+    if not history:
+        print("No attempts found.")
+        return
+
+    print(f"{'Attempt':<8} {'Date':<12} {'Line Acc':<12} {'Char Acc':<10}")
+    print("-" * 46)
+
+    for item in history:
+        dt = datetime.fromtimestamp(item["timestamp"])
+        date_str = dt.strftime("%Y-%m-%d")
+        if item["perfect"]:
+            line_str = f"{ANSI_GREEN}100.0% ★{ANSI_RESET}"
+            char_str = f"{ANSI_GREEN}100.0% ★{ANSI_RESET}"
+        else:
+            line_str = f"{item['line_acc']:>5.1f}%  "
+            char_str = f"{item['char_acc']:>5.1f}%  "
+        print(f"{item['number']:<8} {date_str:<12} {line_str:<21} {char_str}")
+
+    print(HEADER_RULE)
+
+    # Calculate current streak of perfect attempts
+    streak = 0
+    for item in reversed(history):
+        if item["perfect"]:
+            streak += 1
+        else:
+            break
+
+    if streak > 0:
+        print(f"Current Streak: {streak} perfect attempt{'s' if streak != 1 else ''}!")
+
+    # Show best score achieved
+    best = max(item["char_acc"] for item in history)
+    if any(item["perfect"] for item in history):
+        print(f"Best Score: {ANSI_GREEN}100.0%{ANSI_RESET}")
+    else:
+        print(f"Best Score: {best:.1f}% (not yet perfect)")
+
+    review = history[-1].get("review")
+    if review:
+        due = datetime.fromtimestamp(review["due"])
+        days = review["interval"]
+        print(f"Next Review: {due.strftime('%Y-%m-%d')} ({days:g}-day interval)")
+    print()
+
+
+# ==========================================================================
+# SPACED REPETITION
+# ==========================================================================
+
+class ReviewState(NamedTuple):
+    """SM-2 scheduling state of a solution after one graded attempt."""
+    ease: float = SM2_INITIAL_EASE
+    interval: float = 0.0  # days until the next review
+    repetitions: int = 0   # consecutive successful reviews
+    due: float = 0.0       # epoch seconds
+
+    def to_json(self) -> dict:
+        return {
+            "ease": round(self.ease, 4),
+            "interval": self.interval,
+            "repetitions": self.repetitions,
+            "due": self.due,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> ReviewState:
+        return cls(
+            ease=float(data["ease"]),
+            interval=float(data["interval"]),
+            repetitions=int(data["repetitions"]),
+            due=float(data["due"]),
+        )
+
+
+def review_quality(document_score: float, perfect: bool) -> int:
+    """Map an attempt's score onto SM-2's 0-5 recall quality (3+ counts as recalled)."""
+    if perfect:
+        return 5
+    for quality, threshold in ((4, 95.0), (3, 85.0), (2, 70.0), (1, 50.0)):
+        if document_score >= threshold:
+            return quality
+    return 0
+
+
+def schedule_review(previous: ReviewState | None, quality: int, graded_at: float) -> ReviewState:
+    """Apply one SM-2 step: lengthen the interval on recall, restart it on a lapse."""
+    state = previous or ReviewState()
+    if quality < 3:
+        repetitions = 0
+        interval = 1.0
+    else:
+        repetitions = state.repetitions + 1
+        if repetitions == 1:
+            interval = 1.0
+        elif repetitions == 2:
+            interval = 6.0
+        else:
+            interval = round(state.interval * state.ease, 1)
+    miss = 5 - quality
+    ease = max(SM2_MIN_EASE, state.ease + 0.1 - miss * (0.08 + miss * 0.02))
+    return ReviewState(
+        ease=ease,
+        interval=interval,
+        repetitions=repetitions,
+        due=graded_at + interval * SECONDS_PER_DAY,
+    )
+
+
+class DueQueue:
+    """
+    Min-heap of (due, solution) pairs.
+
+    Rescheduling pushes a new pair instead of searching the heap; pairs
+    whose due time no longer matches the solution's current one are
+    discarded when they reach the top.
+    """
+
+    def __init__(self, dues: dict[str, float]) -> None:
+        self._due = dict(dues)
+        self._heap = [(due, rel) for rel, due in self._due.items()]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def push(self, rel: str, due: float) -> None:
+        self._due[rel] = due
+        heapq.heappush(self._heap, (due, rel))
+
+    def pop_due(self, now: float) -> str | None:
+        """Remove and return the most overdue solution, or None if nothing is due."""
+        while self._heap and self._heap[0][0] <= now:
+            due, rel = heapq.heappop(self._heap)
+            if self._due.get(rel) == due:
+                del self._due[rel]
+                return rel
+        return None
+
+
+class HistoryIndex:
+    """
+    Per-solution state derived from attempt records, cached in HISTORY_INDEX_PATH.
+
+    Entries map a solution (relative to SOLUTIONS_ROOT) to its latest
+    attempt number, time, score and perfect flag, its best score and
+    perfect streak, its review state and per-block rollups (see
+    _add_block_rollups).
+
+    Graded attempts are appended to HISTORY_JOURNAL_PATH with the attempts
+    directory's mtime after their record was written, and replayed over the
+    saved index on load. Every HISTORY_JOURNAL_LIMIT attempts the index is
+    rewritten and the journal emptied (see journal). The result is trusted only while
+    the attempts directory's mtime matches the last one saved; otherwise it
+    is rebuilt from the records.
+    """
+
+    def __init__(
+        self,
+        entries: dict[str, dict],
+        attempts_mtime_ns: int | None = None,
+    ) -> None:
+        self.entries = entries
+        self.attempts_mtime_ns = attempts_mtime_ns
+        self.journaled = 0  # attempts in HISTORY_JOURNAL_PATH
+        self._queue: DueQueue | None = None
+
+    @staticmethod
+    def _attempts_mtime() -> int | None:
+        try:
+            return os.stat(ATTEMPTS_ROOT).st_mtime_ns
+        except OSError:
+            return None
+
+    @classmethod
+    def load(cls) -> HistoryIndex:
+        mtime_ns = cls._attempts_mtime()
+        index = cls._load_saved()
+        if index is not None and index.attempts_mtime_ns == mtime_ns:
+            return index
+        index = cls.rebuild()
+        try:
+            index.save()
+        except OSError:
+            pass
+        return index
+
+    @classmethod
+    def _load_saved(cls) -> HistoryIndex | None:
+        """The saved index with the journal replayed over it, or None if unusable."""
+        try:
+            data = json.loads(HISTORY_INDEX_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != HISTORY_INDEX_VERSION:
+            return None
+        index = cls(data["entries"], data["attempts_mtime_ns"])
+        try:
+            with HISTORY_JOURNAL_PATH.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    entry = json.loads(line)
+                    index.add(entry["record"])
+                    index.attempts_mtime_ns = entry["attempts_mtime_ns"]
+                    index.journaled += 1
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError):
+            return None  # e.g. a line cut short by a crash
+        return index
+
+    @classmethod
+    def rebuild(cls) -> HistoryIndex:
+        """
+        Replay every attempt record in attempt order.
+
+        Attempts graded by older versions are given records first (see
+        _claim_legacy_records).
+        """
+        mtime_ns = cls._attempts_mtime()
+        try:
+            names = set(os.listdir(ATTEMPTS_ROOT))
+        except OSError:
+            names = set()
+        records = []
+        legacy: dict[Path, dict | None] = {}
+        for name in names:
+            if name.endswith(".attempt.md"):
+                if name[:-3] + ".json" not in names:
+                    legacy[ATTEMPTS_ROOT / name] = None
+                continue
+            if not name.endswith(".attempt.json"):
+                continue
+            try:
+                with (ATTEMPTS_ROOT / name).open("r", encoding="utf-8") as handle:
+                    record = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            if not isinstance(record, dict):
+                continue
+            if record.get("solution"):
+                records.append(record)
+            else:
+                legacy[ATTEMPTS_ROOT / (name[:-5] + ".md")] = record
+        if legacy:
+            records.extend(_claim_legacy_records(legacy))
+        records.sort(key=lambda r: (r["solution"], r["number"]))
+
+        index = cls({}, mtime_ns)
+        for record in records:
+            index.add(record)
+        try:
+            CACHE_ROOT.mkdir(exist_ok=True)
+            write_text_atomic(
+                ATTEMPT_TABLE_PATH, "".join(attempt_table_row(r) for r in records)
+            )
+        except OSError:
+            pass
+        return index
+
+    def _write(self) -> None:
+        write_json_atomic(
+            HISTORY_INDEX_PATH,
+            {
+                "version": HISTORY_INDEX_VERSION,
+                "attempts_mtime_ns": self.attempts_mtime_ns,
+                "entries": self.entries,
+            },
+        )
+        HISTORY_JOURNAL_PATH.unlink(missing_ok=True)
+        self.journaled = 0
+
+    def save(self) -> None:
+        """Rewrite the saved index from this one, replacing the journal."""
+        with _history_lock():
+            self._write()
+
+    def journal(self, record: dict) -> None:
+        """
+        Persist one added record by appending it to the journal.
+
+        Once the journal is long it is compacted: the saved index and the
+        whole journal are reread from disk, so attempts that other
+        processes journaled since this one loaded are kept, and the merged
+        index is written before the journal is removed. The lock keeps other
+        processes from appending in between.
+        """
+        line = json.dumps(
+            {"attempts_mtime_ns": self.attempts_mtime_ns, "record": record},
+            separators=(",", ":"),
+        )
+        with _history_lock():
+            if not HISTORY_INDEX_PATH.exists():
+                self._write()
+                return
+            with HISTORY_JOURNAL_PATH.open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+            self.journaled += 1
+            if self.journaled < HISTORY_JOURNAL_LIMIT:
+                return
+            merged = self._load_saved()
+            if merged is not None:
+                self.entries = merged.entries
+                self.attempts_mtime_ns = merged.attempts_mtime_ns
+                self._queue = None
+            self._write()
+
+    def review_state(self, rel: str) -> ReviewState | None:
+        entry = self.entries.get(rel)
+        return ReviewState.from_json(entry["review"]) if entry else None
+
+    def add(self, record: dict) -> None:
+        """
+        Fold a graded attempt into its solution's entry.
+
+        A record without a review state (written before scheduling existed)
+        gets one computed from the previous state. Records older than the
+        entry's latest attempt are ignored.
+        """
+        rel = record["solution"]
+        entry = self.entries.get(rel)
+        if entry is not None and record["number"] <= entry["number"]:
+            return
+        if "review" in record:
+            state = ReviewState.from_json(record["review"])
+        else:
+            state = schedule_review(
+                self.review_state(rel),
+                review_quality(record["document_score"], record["perfect"]),
+                record["graded_at"],
+            )
+            record["review"] = state.to_json()
+        blocks = entry["blocks"] if entry is not None else []
+        _add_block_rollups(blocks, record.get("blocks") or [])
+        score, perfect = record["document_score"], record["perfect"]
+        self.entries[rel] = {
+            "number": record["number"],
+            "graded_at": record["graded_at"],
+            "score": score,
+            "perfect": perfect,
+            "best": max(entry["best"], score) if entry is not None else score,
+            "streak": entry["streak"] + 1 if perfect and entry is not None else int(perfect),
+            "review": record["review"],
+            "blocks": blocks,
+        }
+
+        if self._queue is not None:
+            self._queue.push(rel, state.due)
+
+    def queue(self) -> DueQueue:
+        """Due queue over every attempted solution, built on first use."""
+        if self._queue is None:
+            self._queue = DueQueue(
+                {rel: entry["review"]["due"] for rel, entry in self.entries.items()}
+            )
+        return self._queue
+
+
+
+def _add_block_rollups(rollups: list[dict], blocks: Sequence[dict]) -> None:
+    """
+    Accumulate one attempt's block scores into per-block totals.
+
+    "misses" counts, per expected line, the attempts that got it wrong;
+    "line_samples" is the number of attempts those counts cover. Both
+    restart when a block's length changes (the solution was edited).
+    Records from before line tracking only add to the score totals.
+    """
+    for block in blocks:
+        i = block["index"] - 1
+        while len(rollups) <= i:
+            rollups.append({
+                "language": "", "attempts": 0, "perfect": 0,
+                "line_accuracy": 0.0, "char_accuracy": 0.0,
+                "expected_lines": 0, "line_samples": 0, "misses": [],
+            })
+        rollup = rollups[i]
+        rollup["language"] = block["language"]
+        rollup["attempts"] += 1
+        rollup["perfect"] += bool(block["perfect"])
+        rollup["line_accuracy"] += block["line_accuracy"]
+        rollup["char_accuracy"] += block["char_accuracy"]
+
+        missed = block.get("missed_lines")
+        if missed is None:
+            continue
+        lines = block["expected_lines"]
+        if rollup["expected_lines"] != lines:
+            rollup["expected_lines"] = lines
+            rollup["line_samples"] = 0
+            rollup["misses"] = [0] * lines
+        rollup["line_samples"] += 1
+        misses = rollup["misses"]
+        for start, end in missed:
+            for line in range(start, min(end, lines)):
+                misses[line] += 1
+
+
+@contextlib.contextmanager
+def _history_lock() -> Iterator[None]:
+    """Hold HISTORY_LOCK_PATH so journal appends and compaction do not interleave."""
+    CACHE_ROOT.mkdir(exist_ok=True)
+    with HISTORY_LOCK_PATH.open("a") as lock:
+        try:
+            import fcntl
+
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        except ImportError:
+            pass  # no advisory locks; a concurrent compaction may drop a journal line
+        yield
+
+
+_HISTORY_INDEX: HistoryIndex | None = None
+
+
+def history_index() -> HistoryIndex:
+    """The process-wide HistoryIndex, loaded on first use."""
+    global _HISTORY_INDEX
+    if _HISTORY_INDEX is None:
+        _HISTORY_INDEX = HistoryIndex.load()
+    return _HISTORY_INDEX
+
+
+def store_attempt_record(attempt_path: Path, record: dict) -> None:
+    """Schedule the attempt's next review, write its record and update the index."""
+    index = history_index()
+    index.add(record)
+    write_attempt_record(attempt_path, record)
+    index.attempts_mtime_ns = index._attempts_mtime()
+    try:
+        index.journal(record)
+        # A missing table is rebuilt in full by load_attempt_table
+        if ATTEMPT_TABLE_PATH.exists():
+            with ATTEMPT_TABLE_PATH.open("a", encoding="utf-8") as handle:
+                handle.write(attempt_table_row(record))
+    except OSError as exc:
+        print(f"{ANSI_YELLOW}Warning: cannot update {HISTORY_INDEX_PATH}: {exc}{ANSI_RESET}")
+
+
+def collect_review_files(now: float | None = None) -> list[Path]:
+    """
+    Solutions to drill in a --review session: every due one, most overdue
+    first, then up to REVIEW_NEW_LIMIT never-attempted ones in catalog order.
+    """
+    now = time.time() if now is None else now
+    index = history_index()
+    root = SOLUTIONS_ROOT.resolve()
+    queue = index.queue()
+
+    files = []
+    while (rel := queue.pop_due(now)) is not None:
+        if (root / rel).is_file():
+            files.append(root / rel)
+
+    new = 0
+    for rel in iter_solution_catalog(root):
+        if new >= REVIEW_NEW_LIMIT:
+            break
+        if rel.endswith(".md") and rel not in index.entries:
+            files.append(root / rel)
+            new += 1
+    return files
+
+
+def _heat_color(rate: float) -> str:
+    if rate >= 0.5:
+        return ANSI_RED_BG
+    if rate >= 0.2:
+        return ANSI_YELLOW
+    return ANSI_GREEN
+
+
+def render_block_stats(solution_path: Path) -> None:
+    """Print per-block accuracy and a heatmap of missed line ranges."""
+    entry = history_index().entries.get(solution_relative_name(solution_path))
+
+    print(HEADER_RULE)
+    print(f"{ANSI_BOLD}BLOCK WEAKNESS:{ANSI_RESET} {solution_path.name}")
+    print(HEADER_RULE)
+    if entry is None or not entry["blocks"]:
+        print("No attempts found.")
+        return
+
+    for i, rollup in enumerate(entry["blocks"], 1):
+        attempts = rollup["attempts"]
+        if not attempts:
+            continue
+        print(
+            f"{ANSI_BOLD}Block {i}{ANSI_RESET} ({rollup['language'] or 'code'})  "
+            f"{attempts} attempt{'s' if attempts != 1 else ''}  "
+            f"line {rollup['line_accuracy'] / attempts:.1f}%  "
+            f"char {rollup['char_accuracy'] / attempts:.1f}%  "
+            f"perfect {100 * rollup['perfect'] / attempts:.0f}%"
+        )
+
+        samples = rollup["line_samples"]
+        lines = rollup["expected_lines"]
+        if not samples or not lines:
+            print(f"  {ANSI_DIM}(no line-level data yet){ANSI_RESET}")
+            continue
+        span = math.ceil(lines / HEATMAP_MAX_ROWS)
+        for start in range(0, lines, span):
+            end = min(start + span, lines)
+            # Share of (line, attempt) pairs in this range that were missed
+            rate = sum(rollup["misses"][start:end]) / (samples * (end - start))
+            filled = round(rate * HEATMAP_WIDTH)
+            bar = "█" * filled + "░" * (HEATMAP_WIDTH - filled)
+            label = f"{start + 1}-{end}" if end - start > 1 else f"{end}"
+            print(f"  lines {label:<9} {_heat_color(rate)}{bar}{ANSI_RESET} {100 * rate:>5.1f}% missed")
+    print()
+
+
+# ==========================================================================
+# ANALYTICS
+# ==========================================================================
+
+def attempt_table_row(record: dict) -> str:
+    """One line of ATTEMPT_TABLE_PATH: [solution, number, graded_at, score, perfect]."""
+    return json.dumps([
+        record["solution"], record["number"], record["graded_at"],
+        record["document_score"], record["perfect"],
+    ]) + "\n"
+
+
+class AttemptTable:
+    """Columns of every graded attempt, sorted by solution then attempt number."""
+
+    def __init__(
+        self,
+        solutions: list[str],
+        numbers: list[int],
+        times: list[float],
+        scores: list[float],
+        perfect: list[bool],
+    ) -> None:
+        self.solutions = solutions
+        self.numbers = numbers
+        self.times = times
+        self.scores = scores
+        self.perfect = perfect
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+
+def load_attempt_table(since: float | None = None, until: float | None = None) -> AttemptTable:
+    """
+    Read the attempt table kept beside the history index, rebuilding both
+    if the table is missing. Only attempts graded in [since, until) are kept.
+    """
+    global _HISTORY_INDEX
+    history_index()
+    try:
+        text = ATTEMPT_TABLE_PATH.read_text(encoding="utf-8")
+    except OSError:
+        _HISTORY_INDEX = HistoryIndex.rebuild()
+        try:
+            _HISTORY_INDEX.save()
+            text = ATTEMPT_TABLE_PATH.read_text(encoding="utf-8")
+        except OSError:
+            text = ""
+
+    # Every row is a new container object; pausing the cyclic collector
+    # while they are built avoids repeated full scans of the growing heap
+    import gc
+
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        rows = json.loads("[" + text.strip().replace("\n", ",") + "]")
+        # A record rewritten after an interrupted update may appear twice
+        unique = {(row[0], row[1]): row for row in rows}
+        selected = sorted(
+            row for row in unique.values()
+            if (since is None or row[2] >= since) and (until is None or row[2] < until)
+        )
+        columns = list(zip(*selected)) or [(), (), (), (), ()]
+        return AttemptTable(*(list(column) for column in columns))
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def _rolling_indexes(count: int) -> list[int]:
+    """Evenly spaced end positions for the rolling-average points."""
+    first = min(ROLLING_WINDOW, count) - 1
+    if count - 1 == first:
+        return [first]
+    steps = min(ROLLING_POINTS, count - first) - 1
+    return sorted({first + round((count - 1 - first) * k / steps) for k in range(steps + 1)})
+
+
+def _gap_labels() -> list[str]:
+    edges = DECAY_GAP_DAYS
+    labels = [f"< {edges[0]} day{'s' if edges[0] != 1 else ''}"]
+    labels += [f"{lo}-{hi} days" for lo, hi in zip(edges, edges[1:])]
+    return labels + [f"{edges[-1]}+ days"]
+
+
+def _analyze_numpy(table: AttemptTable, now: float, np) -> dict:
+    # Rows are grouped by solution, so each change of name starts a new code
+    solutions = np.array(table.solutions, dtype=object)
+    codes = np.r_[0, np.cumsum(solutions[1:] != solutions[:-1])]
+    numbers = np.array(table.numbers)
+    times = np.array(table.times, dtype=float)
+    scores = np.array(table.scores, dtype=float)
+    perfect = np.array(table.perfect, dtype=bool)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)] - 1
+
+    capped = np.minimum(numbers, CURVE_ATTEMPTS + 1)
+    counts = np.bincount(capped, minlength=CURVE_ATTEMPTS + 2)
+    score_sums = np.bincount(capped, weights=scores, minlength=CURVE_ATTEMPTS + 2)
+    perfect_counts = np.bincount(capped, weights=perfect, minlength=CURVE_ATTEMPTS + 2)
+    curve = [
+        (n, int(counts[n]), float(score_sums[n] / counts[n]), float(100 * perfect_counts[n] / counts[n]))
+        for n in range(1, CURVE_ATTEMPTS + 1) if counts[n]
+    ]
+
+    order = np.argsort(times, kind="stable")
+    sums = np.r_[0.0, np.cumsum(scores[order])]
+    rolling = []
+    for i in _rolling_indexes(len(order)):
+        lo = max(0, i + 1 - ROLLING_WINDOW)
+        rolling.append((float(times[order[i]]), float((sums[i + 1] - sums[lo]) / (i + 1 - lo))))
+
+    perfect_rows = np.flatnonzero(perfect)
+    mastered_codes, first = np.unique(codes[perfect_rows], return_index=True)
+    first_perfect = perfect_rows[first]
+    mastery_attempts = numbers[first_perfect]
+    mastery_days = (times[first_perfect] - times[starts[mastered_codes]]) / SECONDS_PER_DAY
+
+    same = codes[1:] == codes[:-1]
+    gaps = (times[1:] - times[:-1])[same]
+    changes = (scores[1:] - scores[:-1])[same]
+    buckets = np.searchsorted(np.array(DECAY_GAP_DAYS) * SECONDS_PER_DAY, gaps, side="right")
+    bucket_counts = np.bincount(buckets, minlength=len(DECAY_GAP_DAYS) + 1)
+    bucket_sums = np.bincount(buckets, weights=changes, minlength=len(DECAY_GAP_DAYS) + 1)
+    decay = [
+        (label, int(count), float(bucket_sums[b] / count) if count else None)
+        for b, (label, count) in enumerate(zip(_gap_labels(), bucket_counts))
+    ]
+    last_practice = np.maximum.reduceat(times, starts)
+
+    # Running best per solution: offsetting each solution's score ranks past
+    # every earlier solution's makes one running maximum restart at each
+    # boundary, and integer ranks keep it exact
+    distinct, ranks = np.unique(scores, return_inverse=True)
+    offset = codes.astype(np.int64) * len(distinct)
+    best = distinct[np.maximum.accumulate(ranks + offset) - offset]
+    regressed = np.r_[False, same & (scores[1:] < best[:-1] - REGRESSION_MARGIN)]
+    latest = ends[regressed[ends]]
+
+    return {
+        "attempts": len(scores),
+        "solutions": len(starts),
+        "span": (float(times.min()), float(times.max())),
+        "curve": curve,
+        "rolling": rolling,
+        "mastered": len(mastered_codes),
+        "mastery_attempts": np.median(mastery_attempts).item() if len(mastered_codes) else None,
+        "mastery_days": float(np.median(mastery_days)) if len(mastered_codes) else None,
+        "decay": decay,
+        "stale": int(np.count_nonzero(last_practice <= now - STALE_DAYS * SECONDS_PER_DAY)),
+        "regression_events": int(np.count_nonzero(regressed)),
+        "regressions": [
+            (table.solutions[i], float(best[i - 1]), float(scores[i]), float(times[i]))
+            for i in latest
+        ],
+    }
+
+
+def _analyze_python(table: AttemptTable, now: float) -> dict:
+    import statistics
+
+    counts = [0] * (CURVE_ATTEMPTS + 2)
+    score_sums = [0.0] * (CURVE_ATTEMPTS + 2)
+    perfect_counts = [0] * (CURVE_ATTEMPTS + 2)
+    for number, score, perfect in zip(table.numbers, table.scores, table.perfect):
+        n = min(number, CURVE_ATTEMPTS + 1)
+        counts[n] += 1
+        score_sums[n] += score
+        perfect_counts[n] += perfect
+    curve = [
+        (n, counts[n], score_sums[n] / counts[n], 100 * perfect_counts[n] / counts[n])
+        for n in range(1, CURVE_ATTEMPTS + 1) if counts[n]
+    ]
+
+    order = sorted(range(len(table)), key=table.times.__getitem__)
+    sums = [0.0]
+    for i in order:
+        sums.append(sums[-1] + table.scores[i])
+    rolling = []
+    for i in _rolling_indexes(len(order)):
+        lo = max(0, i + 1 - ROLLING_WINDOW)
+        rolling.append((table.times[order[i]], (sums[i + 1] - sums[lo]) / (i + 1 - lo)))
+
+    gap_edges = [days * SECONDS_PER_DAY for days in DECAY_GAP_DAYS]
+    bucket_counts = [0] * (len(gap_edges) + 1)
+    bucket_sums = [0.0] * (len(gap_edges) + 1)
+    mastery_attempts: list[int] = []
+    mastery_days: list[float] = []
+    solutions = stale = regression_events = 0
+    regressions = []
+    stale_before = now - STALE_DAYS * SECONDS_PER_DAY
+
+    i = 0
+    while i < len(table):
+        rel = table.solutions[i]
+        start = i
+        best = None
+        mastered = False
+        last_practice = table.times[i]
+        previous_best = None
+        regressed = False
+        while i < len(table) and table.solutions[i] == rel:
+            time_, score = table.times[i], table.scores[i]
+            last_practice = max(last_practice, time_)
+            if table.perfect[i] and not mastered:
+                mastered = True
+                mastery_attempts.append(table.numbers[i])
+                mastery_days.append((time_ - table.times[start]) / SECONDS_PER_DAY)
+            regressed = False
+            if best is not None:
+                bucket = bisect.bisect_right(gap_edges, time_ - table.times[i - 1])
+                bucket_counts[bucket] += 1
+                bucket_sums[bucket] += score - table.scores[i - 1]
+                previous_best = best
+                regressed = score < best - REGRESSION_MARGIN
+                regression_events += regressed
+            best = score if best is None else max(best, score)
+            i += 1
+        solutions += 1
+        stale += last_practice <= stale_before
+        if regressed:
+            regressions.append((rel, previous_best, table.scores[i - 1], table.times[i - 1]))
+
+    decay = [
+        (label, count, bucket_sums[b] / count if count else None)
+        for b, (label, count) in enumerate(zip(_gap_labels(), bucket_counts))
+    ]
+    return {
+        "attempts": len(table),
+        "solutions": solutions,
+        "span": (min(table.times), max(table.times)),
+        "curve": curve,
+        "rolling": rolling,
+        "mastered": len(mastery_attempts),
+        "mastery_attempts": statistics.median(mastery_attempts) if mastery_attempts else None,
+        "mastery_days": statistics.median(mastery_days) if mastery_days else None,
+        "decay": decay,
+        "stale": stale,
+        "regression_events": regression_events,
+        "regressions": regressions,
+    }
+
+
+def parse_date_bound(text: str, option: str) -> float:
+    """Timestamp of local midnight at the start of a YYYY-MM-DD date."""
+    from datetime import datetime
+
+    try:
+        return datetime.strptime(text, "%Y-%m-%d").timestamp()
+    except ValueError:
+        die(f"{option} expects a date as YYYY-MM-DD, got {text!r}.")
+
+
+def analyze_history(table: AttemptTable, now: float | None = None) -> dict | None:
+    """
+    Learning-curve statistics across every solution in the table.
+
+    Uses NumPy when it is installed and an equivalent pure-Python pass
+    otherwise. Returns None for an empty table.
+    """
+    if not len(table):
+        return None
+    now = time.time() if now is None else now
+    try:
+        import numpy
+    except ImportError:
+        return _analyze_python(table, now)
+    return _analyze_numpy(table, now, numpy)
+
+
+def render_analytics(analysis: dict | None) -> None:
+    """Print the learning-curve report built by analyze_history."""
+    from datetime import datetime
+
+    def date(timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
+
+    print(HEADER_RULE)
+    print(f"{ANSI_BOLD}ANALYTICS{ANSI_RESET}")
+    print(HEADER_RULE)
+    if analysis is None:
+        print("No attempts found.")
+        return
+
+    first, last = analysis["span"]
+    print(
+        f"{analysis['attempts']} attempt{'s' if analysis['attempts'] != 1 else ''} on "
+        f"{analysis['solutions']} solution{'s' if analysis['solutions'] != 1 else ''}, "
+        f"{date(first)} to {date(last)}"
+    )
+
+    print(f"\n{ANSI_BOLD}Learning curve{ANSI_RESET}")
+    print(f"{'Attempt':<8} {'Solutions':<10} {'Mean':<8} {'Perfect':<8}")
+    for number, count, mean, perfect in analysis["curve"]:
+        print(f"{number:<8} {count:<10} {mean:>5.1f}%   {perfect:>5.1f}%")
+
+    print(f"\n{ANSI_BOLD}Rolling average{ANSI_RESET} (last {ROLLING_WINDOW} attempts)")
+    for timestamp, mean in analysis["rolling"]:
+        print(f"{date(timestamp):<12} {mean:>5.1f}%")
+
+    print(f"\n{ANSI_BOLD}Time to mastery{ANSI_RESET} (first perfect attempt)")
+    print(f"Mastered: {analysis['mastered']} of {analysis['solutions']} solutions")
+    if analysis["mastery_attempts"] is not None:
+        print(
+            f"Median: {analysis['mastery_attempts']:g} attempts, "
+            f"{analysis['mastery_days']:.1f} days after the first"
+        )
+
+    print(f"\n{ANSI_BOLD}Decay since last practice{ANSI_RESET} (score change from the previous attempt)")
+    for label, count, change in analysis["decay"]:
+        shown = f"{change:+.1f}" if change is not None else "-"
+        print(f"{label:<12} {count:>7} attempts  {shown:>6}")
+    print(f"Not practiced in {STALE_DAYS}+ days: {analysis['stale']} solutions")
+
+    print(
+        f"\n{ANSI_BOLD}Regressions{ANSI_RESET} (more than {REGRESSION_MARGIN:g} points "
+        f"below the previous best): {analysis['regression_events']}"
+    )
+    worst = sorted(analysis["regressions"], key=lambda r: r[2] - r[1])[:REGRESSIONS_SHOWN]
+    if worst:
+        print("Latest attempt regressed:")
+    for rel, best, score, timestamp in worst:
+        print(f"  {ANSI_YELLOW}{score:>5.1f}%{ANSI_RESET} (best {best:.1f}%)  {date(timestamp)}  {rel}")
+    print()
+
+
+# ==========================================================================
+# PROGRESS SUMMARY
+# ==========================================================================
+
+class SolutionSummary(NamedTuple):
+    """Summary statistics for a single solution file."""
+    path: Path
+    relative_path: str  # e.g., "focus/insertion_sort.md"
+    attempted: bool
+    last_date: datetime | None
+    last_score: float | None
+    best_score: float | None
+    streak: int  # consecutive 100% at end of history
+    mastered: bool  # last attempt was perfect
+
+
+def compute_summary(solution_path: Path, entry: dict | None) -> SolutionSummary:
+    """Derive summary statistics for a solution from its history index entry."""
+    from datetime import datetime
+
+    relative = solution_relative_name(solution_path)
+    
+    if entry is None:
+        return SolutionSummary(
+            path=solution_path,
+            relative_path=relative,
+            attempted=False,
+            last_date=None,
+            last_score=None,
+            best_score=None,
+            streak=0,
+            mastered=False,
+        )
+    
+    return SolutionSummary(
+        path=solution_path,
+        relative_path=relative,
+        attempted=True,
+        last_date=datetime.fromtimestamp(entry["graded_at"]),
+        last_score=entry["score"],
+        best_score=entry["best"],
+        streak=entry["streak"],
+        mastered=entry["perfect"],
+    )
+
+
+def _summary_group_name(rel: str) -> str:
+    parent = rel.rpartition("/")[0]
+    return parent or "(root)"
+
+
+def iter_summary_groups(rel_dir: str = "") -> Iterator[tuple[str, list[str]]]:
+    """
+    Yield (directory, solution paths) for each directory of solution files
+    under rel_dir ("" is the whole catalog), as soon as it is listed.
+
+    solutions/focus/ comes first, then the rest depth-first in name order.
+    Paths are relative to SOLUTIONS_ROOT.
+    """
+    root = SOLUTIONS_ROOT.resolve()
+
+    def groups(files: Iterable[str]) -> Iterator[tuple[str, list[str]]]:
+        import itertools
+
+        solutions = (rel for rel in files if rel.endswith(".md"))
+        for name, group in itertools.groupby(solutions, key=_summary_group_name):
+            yield name, list(group)
+
+    if rel_dir:
+        yield from groups(iter_solution_subtree(rel_dir))
+        return
+    focus = solution_relative_name(FOCUS_DIR.resolve())
+    yield from groups(iter_solution_subtree(focus))
+    yield from groups(
+        rel for rel in iter_solution_catalog(root)
+        if not (rel == focus or rel.startswith(focus + "/"))
+    )
+
+
+def collect_all_summaries(rel_dir: str = "") -> List[SolutionSummary]:
+    """
+    Summary statistics for every solution file under rel_dir (see
+    iter_summary_groups), from the history index without reading attempts.
+    """
+    root = SOLUTIONS_ROOT.resolve()
+    entries = history_index().entries
+    return [
+        compute_summary(root / rel, entries.get(rel))
+        for _, group in iter_summary_groups(rel_dir)
+        for rel in group
+    ]
+
+
+def ranked_summaries(rel_dir: str, sort: str) -> Iterator[SolutionSummary]:
+    """
+    Attempted solutions under rel_dir, ordered by sort, from the history index.
+
+    "worst" is lowest latest score first, "stale" least recently practiced
+    first and "recent" most recently practiced first. Solutions whose file
+    no longer exists are skipped.
+    """
+    root = SOLUTIONS_ROOT.resolve()
+    prefix = rel_dir + "/" if rel_dir else ""
+    entries = history_index().entries
+    keys = {
+        "worst": lambda rel: (entries[rel]["score"], rel),
+        "stale": lambda rel: (entries[rel]["graded_at"], rel),
+        "recent": lambda rel: (-entries[rel]["graded_at"], rel),
+    }
+    candidates = [rel for rel in entries if rel.startswith(prefix) and rel.endswith(".md")]
+    for rel in sorted(candidates, key=keys[sort]):
+        path = root / rel
+        if path.is_file():
+            yield compute_summary(path, entries[rel])
+
+
+def _summary_row(s: SolutionSummary, name: str) -> str:
+    date_str = s.last_date.strftime("%Y-%m-%d") if s.last_date else ""
+    if not s.attempted:
+        return f"  {ANSI_DIM}{name:<28} —  (no attempts){ANSI_RESET}"
+    if s.mastered:
+        streak_str = f"streak: {s.streak}" if s.streak > 0 else ""
+        return f"  {ANSI_GREEN}{name:<28} ✓ 100%  {date_str}  {streak_str}{ANSI_RESET}"
+    score_str = f"{s.last_score:>3.0f}%" if s.last_score else ""
+    return f"  {ANSI_YELLOW}{name:<28} ✗ {score_str}  {date_str}{ANSI_RESET}"
+
+
+def resolve_summary_scope(raw: str) -> str:
+    """Resolve a --summary PATH to a directory relative to SOLUTIONS_ROOT."""
+    root = SOLUTIONS_ROOT.resolve()
+    raw_path = Path(raw).expanduser()
+    if raw_path.is_absolute():
+        candidates = [raw_path]
+    else:
+        candidates = [Path.cwd() / raw_path, BASE_DIR / raw_path, root / raw_path]
+    for candidate in candidates:
+        path = candidate.resolve()
+        if path.is_dir() and (path == root or root in path.parents):
+            return str(path.relative_to(root)) if path != root else ""
+    die(f"Directory '{raw}' not found under '{SOLUTIONS_ROOT}'.")
+
+
+def render_summary(scope: str = "", *, sort: str | None = None, limit: int | None = None) -> None:
+    """
+    Print the progress summary for the solutions under scope.
+
+    Without sort, solutions are listed grouped by directory and each group
+    is printed (and flushed) as soon as it is read. With sort, attempted
+    solutions are listed in that order (see ranked_summaries). Either way
+    at most limit solutions are listed. The totals cover every solution
+    file under scope that exists now, so attempts of deleted or moved
+    solutions are not counted.
+    """
+    from datetime import datetime
+
+    print(HEADER_RULE)
+    title = f": {SOLUTIONS_DIR}/{scope}/" if scope else ""
+    print(f"{ANSI_BOLD}PROGRESS SUMMARY{ANSI_RESET}{title}")
+    print(HEADER_RULE)
+    print()
+
+    entries = history_index().entries
+    totals = {"solutions": 0, "attempted": 0, "mastered": 0, "last_practice": 0.0}
+
+    def count(rels: Iterable[str]) -> None:
+        for rel in rels:
+            totals["solutions"] += 1
+            entry = entries.get(rel)
+            if entry is not None:
+                totals["attempted"] += 1
+                totals["mastered"] += bool(entry["perfect"])
+                totals["last_practice"] = max(totals["last_practice"], entry["graded_at"])
+
+    listed = 0
+    truncated = False
+    if sort is not None:
+        for s in ranked_summaries(scope, sort):
+            if limit is not None and listed >= limit:
+                truncated = True
+                break
+            print(_summary_row(s, s.relative_path))
+            listed += 1
+        if listed:
+            print()
+        files = iter_solution_subtree(scope) if scope else iter_solution_catalog()
+        count(rel for rel in files if rel.endswith(".md"))
+    else:
+        root = SOLUTIONS_ROOT.resolve()
+        for group_name, group in iter_summary_groups(scope):
+            count(group)
+            if limit is not None and listed >= limit:
+                truncated = True
+                continue  # still counted for the totals
+            attempted_in_group = sum(1 for rel in group if rel in entries)
+
+            # Collapse large unattempted directories
+            if len(group) > SUMMARY_COLLAPSE_THRESHOLD and attempted_in_group == 0:
+                print(f"{ANSI_DIM}{SOLUTIONS_DIR}/{group_name}/{ANSI_RESET}")
+                print(f"  {ANSI_DIM}({len(group)} files, 0 attempted){ANSI_RESET}")
+                print()
+            else:
+                print(f"{SOLUTIONS_DIR}/{group_name}/")
+                shown = group if limit is None else group[:limit - listed]
+                truncated = truncated or len(shown) < len(group)
+                for rel in shown:
+                    summary = compute_summary(root / rel, entries.get(rel))
+                    print(_summary_row(summary, summary.path.name))
+                listed += len(shown)
+                print()
+            sys.stdout.flush()
+
+    total_solutions = totals["solutions"]
+    if not total_solutions:
+        print("No solution files found.")
+        return
+
+    print("-" * 40)
+    if truncated:
+        print(f"{ANSI_DIM}(showing the first {limit}; raise --limit for more){ANSI_RESET}")
+    mastery_str = f"{totals['mastered']}/{total_solutions} mastered (last attempt 100%)"
+    print(f"TOTALS: {totals['attempted']}/{total_solutions} attempted | {mastery_str}")
+    if totals["last_practice"]:
+        last = datetime.fromtimestamp(totals["last_practice"])
+        print(f"Last practice: {last.strftime('%Y-%m-%d')}")
+    print(HEADER_RULE)
+
+
+@contextlib.contextmanager
+def paged_output() -> Iterator[None]:
+    """
+    Send stdout through $PAGER while the block runs, when stdout is a terminal.
+
+    Output reaches the pager as it is flushed, so it can show the first
+    page before the rest is ready. Closing the pager early ends the block
+    quietly. LESS defaults to FRX (keep colors, exit if one screen).
+    """
+    pager = os.environ.get("PAGER", "").strip()
+    if not pager or not sys.stdout.isatty():
+        yield
+        return
+    import shlex
+    import subprocess
+
+    env = dict(os.environ)
+    env.setdefault("LESS", "FRX")
+    try:
+        proc = subprocess.Popen(shlex.split(pager), stdin=subprocess.PIPE, env=env, encoding="utf-8")
+    except (OSError, ValueError) as exc:
+        print(f"{ANSI_YELLOW}Warning: cannot start pager '{pager}': {exc}{ANSI_RESET}")
+        yield
+        return
+    try:
+        with contextlib.redirect_stdout(proc.stdin):
+            yield
+    except BrokenPipeError:
+        pass  # the pager quit before reading everything
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        proc.wait()
+
+
+# ==========================================================================
+# FULL-TEXT SEARCH
+# ==========================================================================
+
+def _tokenize(text: str) -> list[str]:
+    return SEARCH_TOKEN_PATTERN.findall(text.lower())
+
+
+def extract_search_terms(text: str) -> tuple[str, dict[str, int]]:
+    """
+    Return (title, term weights) for a solution's headings, prose and target blocks.
+
+    Heading terms count HEADING_WEIGHT times; INFO blocks are not indexed.
+    """
+    parsed = parse_markdown(text)
+    title = ""
+    weights: dict[str, int] = {}
+
+    def add(chunk: str, weight: int) -> None:
+        for token in _tokenize(chunk):
+            weights[token] = weights.get(token, 0) + weight
+
+    def add_prose(chunk: str) -> None:
+        nonlocal title
+        for line in chunk.splitlines():
+            if line.startswith("#"):
+                heading = line.lstrip("#").strip()
+                if not title:
+                    title = heading
+                add(heading, HEADING_WEIGHT)
+            else:
+                add(line, 1)
+
+    cursor = 0
+    for block in parsed.blocks:
+        add_prose(text[cursor:block.start_pos])
+        if block.is_target:
+            add(block.content, 1)
+        cursor = block.end_pos
+    add_prose(text[cursor:])
+    return title, weights
+
+
+class SearchIndex:
+    """
+    Inverted index over solution Markdown, persisted in SEARCH_INDEX_PATH.
+
+    ``files`` maps each indexed path to [mtime_ns, size, title, terms] and
+    ``postings`` maps each term to {path: weight}. refresh() re-reads only
+    files whose stat changed and drops postings of removed files.
+    """
+
+    def __init__(self, root: Path, files: dict[str, list], postings: dict[str, dict[str, int]]) -> None:
+        self.root = root
+        self.files = files
+        self.postings = postings
+
+    @classmethod
+    def load(cls, root: Path) -> SearchIndex:
+        try:
+            with SEARCH_INDEX_PATH.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if data["version"] == SEARCH_INDEX_VERSION and data["root"] == str(root):
+                return cls(root, data["files"], data["postings"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return cls(root, {}, {})
+
+    def save(self) -> None:
+        try:
+            CACHE_ROOT.mkdir(exist_ok=True)
+            write_json_atomic(
+                SEARCH_INDEX_PATH,
+                {
+                    "version": SEARCH_INDEX_VERSION,
+                    "root": str(self.root),
+                    "files": self.files,
+                    "postings": self.postings,
+                },
+            )
+        except OSError:
+            pass
+
+    def _remove(self, rel: str) -> None:
+        for term in self.files.pop(rel)[3]:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(rel, None)
+                if not posting:
+                    del self.postings[term]
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with the solution tree; return True if it changed."""
+        changed = False
+        seen: set[str] = set()
+        for rel in iter_solution_catalog(self.root):
+            if not rel.endswith(".md"):
+                continue
+            seen.add(rel)
+            path = self.root / rel
+            try:
+                st = path.stat()
+                entry = self.files.get(rel)
+                if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                    continue
+                title, weights = extract_search_terms(path.read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError):
+                continue
+            if entry is not None:
+                self._remove(rel)
+            self.files[rel] = [st.st_mtime_ns, st.st_size, title, sorted(weights)]
+            for term, weight in weights.items():
+                self.postings.setdefault(term, {})[rel] = weight
+            changed = True
+
+        for rel in [r for r in self.files if r not in seen]:
+            self._remove(rel)
+            changed = True
+        return changed
+
+    def query(self, text: str) -> list[tuple[str, str, float]]:
+        """Return (path, title, score) for files containing every query term, best first."""
+        terms = list(dict.fromkeys(_tokenize(text)))
+        if not terms:
+            return []
+        postings: list[dict[str, int]] = []
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                return []
+            postings.append(posting)
+
+        total = len(self.files)
+        postings.sort(key=len)
+        idf = [math.log(1 + total / len(p)) for p in postings]
+        scores: dict[str, float] = {}
+        for rel in postings[0]:
+            if all(rel in p for p in postings[1:]):
+                scores[rel] = sum(p[rel] * w for p, w in zip(postings, idf))
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(rel, self.files[rel][2], score) for rel, score in ranked]
+
+
+def search_solutions(query: str) -> list[tuple[str, str, float]]:
+    """Refresh the persistent search index as needed and run the query against it."""
+    index = SearchIndex.load(SOLUTIONS_ROOT.resolve())
+    if index.refresh():
+        index.save()
+    return index.query(query)
+
+
+def render_search_results(query: str, results: Sequence[tuple[str, str, float]]) -> None:
+    """Print ranked search matches."""
+    print(HEADER_RULE)
+    print(f"{ANSI_BOLD}SEARCH:{ANSI_RESET} {query}")
+    print(HEADER_RULE)
+
+    if not results:
+        print("No matching solutions.")
+        return
+
+    for i, (rel, title, _) in enumerate(results, 1):
+        title_str = f"  {ANSI_DIM}{title}{ANSI_RESET}" if title else ""
+        print(f" {i:2}. {SOLUTIONS_DIR}/{rel}{title_str}")
+    print(HEADER_RULE)
+    print(f"{len(results)} match{'es' if len(results) != 1 else ''} (drill them with --search QUERY --focus)")
+
+
+# ==========================================================================
+# DAEMON
+# ==========================================================================
+
+def prepared_to_json(prepared: PreparedDrill) -> dict:
+    """Serialize a PreparedDrill for the daemon protocol."""
+    return {
+        "solution_path": str(prepared.solution_path),
+        "raw_text": prepared.parsed.raw_text,
+        "blocks": [
+            [b.language, b.content, b.start_pos, b.end_pos, b.is_target]
+            for b in prepared.parsed.blocks
+        ],
+        "template": prepared.template,
+        "expected_lines": prepared.expected_lines,
+        "peek_content": prepared.peek_content,
+    }
+
+
+def prepared_from_json(data: dict) -> PreparedDrill:
+    """Rebuild a PreparedDrill serialized by prepared_to_json."""
+    blocks = [CodeBlock(*fields) for fields in data["blocks"]]
+    return PreparedDrill(
+        solution_path=Path(data["solution_path"]),
+        parsed=ParsedMarkdown(
+            raw_text=data["raw_text"],
+            blocks=blocks,
+            target_blocks=[b for b in blocks if b.is_target],
+        ),
+        template=data["template"],
+        expected_lines=data["expected_lines"],
+        peek_content=data["peek_content"],
+    )
+
+
+class DaemonState:
+    """
+    Warm caches held by a running daemon.
+
+    Parsed solutions are keyed by path and revalidated by (mtime_ns, size).
+    Attempt histories are keyed by solution_relative_name (solutions in
+    different directories may share a stem) and dropped together, along
+    with the loaded history index, whenever the attempts directory's mtime
+    changes, which happens on every new attempt file or record.
+    """
+
+    def __init__(self) -> None:
+        self._prepared: dict[Path, tuple[int, int, PreparedDrill]] = {}
+        self._history: dict[str, List[dict]] = {}
+        self._attempts_mtime: int | None = None
+
+    def prepared(self, solution_path: Path) -> PreparedDrill:
+        st = solution_path.stat()
+        cached = self._prepared.get(solution_path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        prepared = prepare_drill(solution_path)
+        self._prepared[solution_path] = (st.st_mtime_ns, st.st_size, prepared)
+        return prepared
+
+    def history_changed(self) -> None:
+        """Drop cached histories and the history index if attempts changed."""
+        global _HISTORY_INDEX
+        try:
+            mtime_ns: int | None = ATTEMPTS_ROOT.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns != self._attempts_mtime:
+            self._history.clear()
+            _HISTORY_INDEX = None
+            self._attempts_mtime = mtime_ns
+
+    def history(self, solution_path: Path) -> List[dict]:
+        self.history_changed()
+        key = solution_relative_name(solution_path)
+        if key not in self._history:
+            self._history[key] = get_attempt_history(solution_path)
+        return self._history[key]
+
+    def handle(self, request: dict) -> dict:
+        """Answer one protocol request; rendered output is returned as text."""
+        command = request.get("command")
+        if command == "ping":
+            return {"ok": True}
+        if command == "prepare":
+            prepared = self.prepared(Path(request["path"]))
+            return {"ok": True, "prepared": prepared_to_json(prepared)}
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            if command == "summary":
+                self.history_changed()
+                limit = request.get("limit")
+                render_summary(
+                    request.get("path", ""),
+                    sort=request.get("sort") or None,
+                    limit=int(limit) if limit else None,
+                )
+            elif command == "stats":
+                solution_path = Path(request["path"])
+                render_stats(solution_path, self.history(solution_path))
+            else:
+                return {"ok": False, "error": f"unknown command {command!r}"}
+        return {"ok": True, "output": out.getvalue()}
+
+
+def daemon_request(command: str, **params: str) -> dict | None:
+    """
+    Send one request to a running daemon and return its reply.
+
+    Returns None when no daemon is listening, it does not answer within
+    DAEMON_TIMEOUT, or it reports an error, so callers fall back to doing
+    the work locally.
+    """
+    if not DAEMON_SOCKET_PATH.exists():
+        return None
+    import socket
+
+    request = {"version": DAEMON_PROTOCOL_VERSION, "command": command, **params}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(DAEMON_TIMEOUT)
+            sock.connect(str(DAEMON_SOCKET_PATH))
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                reply = json.loads(stream.readline())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(reply, dict) or not reply.get("ok"):
+        return None
+    return reply
+
+
+def load_drill(solution_path: Path) -> PreparedDrill:
+    """prepare_drill, answered from the daemon's parse cache when one is running."""
+    reply = daemon_request("prepare", path=str(solution_path.resolve()))
+    if reply is not None:
+        return prepared_from_json(reply["prepared"])
+    return prepare_drill(solution_path)
+
+
+def run_daemon() -> int:
+    """
+    Serve summary, stats and drill-preparation requests on DAEMON_SOCKET_PATH.
+
+    The protocol is one JSON object per line in each direction, one request
+    per connection. Requests are handled one at a time, so the caches need
+    no locking. Runs until interrupted or terminated.
+    """
+    import signal
+    import socketserver
+
+    if daemon_request("ping") is not None:
+        die(f"A memorizer daemon is already listening on '{DAEMON_SOCKET_PATH}'.")
+    CACHE_ROOT.mkdir(exist_ok=True)
+    # A socket left behind by a daemon that did not shut down cleanly
+    DAEMON_SOCKET_PATH.unlink(missing_ok=True)
+
+    state = DaemonState()
+    # Walk the catalog and load the history index so the first request is warm
+    state.history_changed()
+    collect_all_summaries()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            try:
+                request = json.loads(self.rfile.readline())
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+                if request.get("version") != DAEMON_PROTOCOL_VERSION:
+                    reply = {"ok": False, "error": "protocol version mismatch"}
+                else:
+                    reply = state.handle(request)
+            except (OSError, UnicodeDecodeError, ValueError, KeyError, TypeError) as exc:
+                reply = {"ok": False, "error": str(exc)}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+    try:
+        server = socketserver.UnixStreamServer(str(DAEMON_SOCKET_PATH), Handler)
+    except OSError as exc:
+        die(f"Cannot listen on '{DAEMON_SOCKET_PATH}': {exc}")
+    os.chmod(DAEMON_SOCKET_PATH, 0o600)
+
+    def stop(signum: int, frame: object) -> None:
+        raise KeyboardInterrupt
+
+    # Background jobs ignore SIGINT, so also shut down cleanly on kill
+    signal.signal(signal.SIGTERM, stop)
+    print(f"memorizer daemon listening on {DAEMON_SOCKET_PATH} (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.server_close()
+        DAEMON_SOCKET_PATH.unlink(missing_ok=True)
+    return 0
+
+
+# ==========================================================================
+# MAIN
+# ==========================================================================
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.profile is None:
+        try:
+            return run_command(args)
+        finally:
+            METRICS.flush()
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return run_command(args)
+    finally:
+        METRICS.flush()
+        profiler.disable()
+        try:
+            profiler.dump_stats(args.profile)
+        except OSError as exc:
+            print(f"ERROR: Cannot write profile to '{args.profile}': {exc}", file=sys.stderr)
+        else:
+            print(f"Profile written to {args.profile}", file=sys.stderr)
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """Dispatch parsed arguments to the selected mode."""
+    if args.stats and args.focus:
+        die("--stats cannot be combined with --focus.")
+
+    if args.blocks and not args.stats:
+        die("--blocks only works with --stats.")
+
+    if args.watch and (
+        args.stats or args.focus or args.summary is not None or args.search is not None
+    ):
+        die("--watch only works with a single solution.")
+
+    if args.review and (
+        args.solution or args.stats or args.focus or args.summary is not None or args.watch
+        or args.search is not None
+    ):
+        die("--review cannot be combined with a solution, --stats, --focus, --summary, --search or --watch.")
+
+    if args.type and (args.watch or args.nvim_server):
+        die("--type cannot be combined with --watch or --nvim-server.")
+
+    if args.daemon:
+        if (
+            args.solution or args.stats or args.focus or args.summary is not None or args.watch
+            or args.review or args.analytics or args.type or args.search is not None
+        ):
+            die("--daemon cannot be combined with other options.")
+        return run_daemon()
+
+    if args.full_diff:
+        view = DiffView(collapse_above=None)
+    elif args.context is not None:
+        if args.context < 0:
+            die("--context must be zero or greater.")
+        view = DiffView(context=args.context, collapse_above=0)
+    else:
+        view = DiffView()
+
+    if (args.sort or args.limit is not None) and args.summary is None:
+        die("--sort and --limit only work with --summary.")
+
+    if (args.since or args.until) and not args.analytics:
+        die("--since and --until only work with --analytics.")
+
+    if args.analytics:
+        if (
+            args.solution or args.stats or args.focus or args.summary is not None or args.watch
+            or args.review or args.search is not None
+        ):
+            die("--analytics cannot be combined with other options.")
+        since = parse_date_bound(args.since, "--since") if args.since else None
+        until = parse_date_bound(args.until, "--until") + SECONDS_PER_DAY if args.until else None
+        scan_started = time.perf_counter()
+        table = load_attempt_table(since, until)
+        METRICS.observe(
+            "memorizer_history_scan_seconds",
+            time.perf_counter() - scan_started,
+            {"scope": "analytics"},
+        )
+        render_analytics(analyze_history(table))
+        return 0
+
+    if args.summary is not None:
+        if args.stats or args.focus or args.solution or args.search is not None:
+            die("--summary cannot be combined with other options.")
+        if args.limit is not None and args.limit < 1:
+            die("--limit must be at least 1.")
+        scope = resolve_summary_scope(args.summary) if args.summary else ""
+        scan_started = time.perf_counter()
+        reply = daemon_request(
+            "summary",
+            path=scope,
+            sort=args.sort or "",
+            limit="" if args.limit is None else str(args.limit),
+        )
+        if reply is None:
+            history_index()
+        METRICS.observe(
+            "memorizer_history_scan_seconds",
+            time.perf_counter() - scan_started,
+            {"scope": "summary"},
+        )
+        with paged_output():
+            if reply is not None:
+                sys.stdout.write(reply["output"])
+            else:
+                render_summary(scope, sort=args.sort, limit=args.limit)
+        return 0
+
+    if args.search is not None:
+        if args.stats or args.solution:
+            die("--search can only be combined with --focus.")
+        results = search_solutions(args.search)
+        if not args.focus:
+            render_search_results(args.search, results)
+            return 0
+        if not results:
+            die(f"No solutions match '{args.search}'.")
+        root = SOLUTIONS_ROOT.resolve()
+        return run_focus_session(
+            [root / rel for rel, _, _ in results],
+            view=view,
+            shuffle=False,
+            editor=make_editor(args.nvim_server, typing=args.type),
+            show_timings=args.timings,
+        )
+
+    solution_path: Path | None = None
+    if args.solution:
+        solution_path = validate_solution_path(args.solution)
+
+    if args.stats:
+        if solution_path is None:
+            solution_path = interactive_select(SOLUTIONS_ROOT)
+        scan_started = time.perf_counter()
+        reply = daemon_request("stats", path=str(solution_path.resolve()))
+        if reply is None:
+            history = get_attempt_history(solution_path)
+        METRICS.observe(
+            "memorizer_history_scan_seconds",
+            time.perf_counter() - scan_started,
+            {"scope": "stats"},
+        )
+        if reply is not None:
+            sys.stdout.write(reply["output"])
+        else:
+            render_stats(solution_path, history)
+        if args.blocks:
+            print()
+            render_block_stats(solution_path)
+        return 0
+
+    if args.review:
+        review_files = collect_review_files()
+        if not review_files:
+            print("Nothing is due for review.")
+            return 0
+        print(f"{len(review_files)} solution{'s' if len(review_files) != 1 else ''} to review")
+        return run_focus_session(
+            review_files,
+            view=view,
+            shuffle=False,
+            editor=make_editor(args.nvim_server, typing=args.type),
+            show_timings=args.timings,
+        )
+
+    exit_codes: dict[str, int] = {"perfect": 0, "stopped": 1, "quit": 2}
+
+    if args.watch:
+        if solution_path is None:
+            solution_path = interactive_select(SOLUTIONS_ROOT)
+        result = run_watch(solution_path, view=view, editor=nvim_server_editor(args.nvim_server))
+        return exit_codes[result]
+
+    if solution_path is not None:
+        result = run_drill(
+            solution_path,
+            view=view,
+            editor=make_editor(args.nvim_server, typing=args.type),
+            show_timings=args.timings,
+        )
+        return exit_codes[result]
+
+    if args.focus:
+        focus_files = collect_focus_files()
+        if not focus_files:
+            die(f"No readable solutions found under '{FOCUS_DIR}'.")
+        return run_focus_session(
+            focus_files,
+            view=view,
+            editor=make_editor(args.nvim_server, typing=args.type),
+            show_timings=args.timings,
+        )
+
+    solution_path = interactive_select(SOLUTIONS_ROOT)
+    result = run_drill(
+        solution_path,
+        view=view,
+        editor=make_editor(args.nvim_server, typing=args.type),
+        show_timings=args.timings,
+    )
+    return exit_codes[result]
+
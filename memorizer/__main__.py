@@ -0,0 +1,8 @@
+"""Entry point for ``python3 -m memorizer``."""
+
+import sys
+
+from memorizer import main
+
+sys.argv[0] = "python3 -m memorizer"  # argparse names the program after argv[0]
+sys.exit(main())
@@ -0,0 +1,72 @@
+"""Shared fixtures: a throwaway solutions/attempts/cache tree for memorizer."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import memorizer  # noqa: E402
+
+SOLUTION = "# Dup\n\n```python\nprint(1)\n```\n"
+
+
+@pytest.fixture
+def root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point memorizer's solutions, attempts and every cache path at tmp_path."""
+    monkeypatch.setattr(memorizer, "SOLUTIONS_ROOT", tmp_path / "solutions")
+    monkeypatch.setattr(memorizer, "FOCUS_DIR", tmp_path / "solutions" / "focus")
+    monkeypatch.setattr(memorizer, "ATTEMPTS_ROOT", tmp_path / "attempts")
+    old_cache = memorizer.CACHE_ROOT
+    for name, value in list(vars(memorizer).items()):
+        if name.isupper() and isinstance(value, Path) and old_cache in value.parents:
+            monkeypatch.setattr(memorizer, name, tmp_path / ".cache" / value.relative_to(old_cache))
+    monkeypatch.setattr(memorizer, "CACHE_ROOT", tmp_path / ".cache")
+    monkeypatch.setattr(memorizer, "_HISTORY_INDEX", None)
+    monkeypatch.setattr(memorizer, "_CATALOG_MEMO", None)
+    (tmp_path / "solutions").mkdir()
+    (tmp_path / "attempts").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def add_solution(root: Path) -> Callable[[str], Path]:
+    def add(rel: str) -> Path:
+        path = root / "solutions" / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(SOLUTION, encoding="utf-8")
+        return path
+    return add
+
+
+def make_record(name: str, solution: str, number: int, graded_at: float = 1_700_000_060.0) -> dict:
+    """An attempt record for a perfect attempt named <name>.attempt.md."""
+    return {
+        "version": memorizer.RECORD_VERSION,
+        "solution": solution,
+        "attempt": f"{name}.attempt.md",
+        "number": number,
+        "started_at": graded_at - 60,
+        "graded_at": graded_at,
+        "document_score": 100.0,
+        "perfect": True,
+        "blocks": [],
+    }
+
+
+@pytest.fixture
+def write_attempt(root: Path) -> Callable[[str, str, int], dict]:
+    """Write a graded attempt and its record under attempts/; returns the record."""
+    def write(name: str, solution: str, number: int) -> dict:
+        attempts = root / "attempts"
+        record = make_record(name, solution, number)
+        (attempts / f"{name}.attempt.md").write_text("graded\n", encoding="utf-8")
+        (attempts / f"{name}.attempt.json").write_text(json.dumps(record), encoding="utf-8")
+        return record
+    return write
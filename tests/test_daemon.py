@@ -0,0 +1,19 @@
+"""Daemon caches must answer exactly what the CLI answers without a daemon."""
+
+from __future__ import annotations
+
+import memorizer
+
+
+def test_history_of_same_named_solutions_is_kept_apart(add_solution, write_attempt):
+    a = add_solution("a/dup.md")
+    b = add_solution("b/dup.md")
+    write_attempt("dup-1", "a/dup.md", 1)
+
+    state = memorizer.DaemonState()
+    a_history = state.history(a)
+    b_history = state.history(b)
+
+    assert [item["number"] for item in a_history] == [1]
+    assert b_history == []
+    assert b_history == memorizer.get_attempt_history(b)
@@ -0,0 +1,29 @@
+"""The history index journal must not lose attempts graded by other processes."""
+
+from __future__ import annotations
+
+import memorizer
+from conftest import make_record
+
+
+def test_compaction_keeps_attempts_journaled_by_another_process(add_solution, monkeypatch):
+    monkeypatch.setattr(memorizer, "HISTORY_JOURNAL_LIMIT", 3)
+    for i in range(4):
+        add_solution(f"s{i}.md")
+    memorizer.HistoryIndex.load()  # writes the empty index both processes start from
+
+    watcher = memorizer.HistoryIndex.load()  # e.g. a --watch session
+    drill = memorizer.HistoryIndex.load()
+    other = make_record("s0-1", "s0.md", 1)
+    watcher.add(other)
+    watcher.journal(other)
+
+    # The drill never saw the watcher's attempt and compacts on its third
+    for i in (1, 2, 3):
+        record = make_record(f"s{i}-1", f"s{i}.md", 1)
+        drill.add(record)
+        drill.journal(record)
+    assert not memorizer.HISTORY_JOURNAL_PATH.exists()
+
+    assert sorted(memorizer.HistoryIndex.load().entries) == ["s0.md", "s1.md", "s2.md", "s3.md"]
+    assert "s0.md" in drill.entries
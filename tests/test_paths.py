@@ -0,0 +1,15 @@
+"""Solution names must not depend on how the checkout's path is spelled."""
+
+from __future__ import annotations
+
+import memorizer
+
+
+def test_relative_name_under_symlinked_checkout(root, add_solution, monkeypatch):
+    solution = add_solution("a/dup.md")
+    link = root / "link"
+    link.symlink_to(root, target_is_directory=True)
+    monkeypatch.setattr(memorizer, "SOLUTIONS_ROOT", link / "solutions")
+
+    assert memorizer.solution_relative_name(link / "solutions" / "a" / "dup.md") == "a/dup.md"
+    assert memorizer.solution_relative_name(solution.resolve()) == "a/dup.md"
@@ -0,0 +1,29 @@
+"""--summary totals must agree with the solutions it lists."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+
+import memorizer
+
+
+def summary_totals(scope: str = "", sort: str | None = None) -> str:
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        memorizer.render_summary(scope, sort=sort)
+    return next(line for line in out.getvalue().splitlines() if line.startswith("TOTALS:"))
+
+
+def test_totals_skip_deleted_solutions(add_solution, write_attempt):
+    dup = add_solution("a/dup.md")
+    add_solution("a/kept.md")
+    add_solution("b/dup.md")
+    write_attempt("dup-1", "a/dup.md", 1)
+    write_attempt("kept-1", "a/kept.md", 1)
+
+    assert summary_totals().startswith("TOTALS: 2/3 attempted | 2/3 mastered")
+    dup.unlink()
+    assert summary_totals().startswith("TOTALS: 1/2 attempted | 1/2 mastered")
+    assert summary_totals("a").startswith("TOTALS: 1/1 attempted")
+    assert summary_totals(sort="worst").startswith("TOTALS: 1/2 attempted")